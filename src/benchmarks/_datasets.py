@@ -0,0 +1,26 @@
+import os
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from typing import Iterator, List
+
+DATASETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datasets')
+
+
+@contextmanager
+def extracted_hars(limit: int = 0) -> Iterator[List[str]]:
+    """
+    Extract the bundled dataset zips to a temporary directory and yield the HAR paths.
+    `limit` caps the number of files (0 = all).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        paths: List[str] = []
+        for name in sorted(os.listdir(DATASETS_DIR)):
+            if not name.endswith('.zip'):
+                continue
+            with zipfile.ZipFile(os.path.join(DATASETS_DIR, name)) as zf:
+                for member in zf.namelist():
+                    if member.endswith('.har'):
+                        paths.append(zf.extract(member, tmp))
+        paths.sort()
+        yield paths[:limit] if limit else paths
@@ -0,0 +1,86 @@
+"""
+URL evaluation scaling: per-CSV maps probed in nested loops vs one SerpIndex.
+
+Usage (from src/):
+    python -m benchmarks.bench_evaluation [--csvs 10 50 200] [--urls 1000 10000] [--rows 500]
+
+Writes synthetic SERP CSVs to a temp dir and times load + match for each
+combination of CSV count and LLM URL count.
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from evaluators.evaluation import SerpIndex
+
+
+def write_csvs(folder, n_csvs, rows, pool, rng):
+    paths = []
+    for k in range(n_csvs):
+        path = os.path.join(folder, f"bench_{k}_{'bing' if k % 2 else 'google'}_q.csv")
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(["Page Title", "URL"])
+            for _ in range(rows):
+                writer.writerow(["title", rng.choice(pool)])
+        paths.append(path)
+    return paths
+
+
+def legacy_exact_map(csv_path):
+    # the pre-index evaluation.load_csv_index: {url -> first row index}
+    exact_map = {}
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for idx, row in enumerate(csv.DictReader(f), start=1):
+            url = row.get('URL', '').strip()
+            if url and url not in exact_map:
+                exact_map[url] = idx
+    return exact_map
+
+
+def legacy_match(csv_paths, urls):
+    # the pre-index check_urls: one map per CSV, every URL probes every CSV
+    csv_data = {path: legacy_exact_map(path) for path in csv_paths}
+    found = {}
+    for url in urls:
+        matched = [(path, exact[url], "exact") for path, exact in csv_data.items() if url in exact]
+        if matched:
+            found[url] = matched
+    return found
+
+
+def indexed_match(csv_paths, urls):
+    return SerpIndex.from_csvs(csv_paths).match(urls, csv_paths)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--csvs', nargs='+', type=int, default=[10, 50, 200])
+    parser.add_argument('--urls', nargs='+', type=int, default=[1000, 10000])
+    parser.add_argument('--rows', type=int, default=500, help='Rows per SERP CSV')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = [f"https://www.site{i % 500}.com/page/{i}" for i in range(50_000)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_csvs in args.csvs:
+            paths = write_csvs(tmp, n_csvs, args.rows, pool, rng)
+            for n_urls in args.urls:
+                urls = rng.sample(pool, n_urls)
+                timings = []
+                for fn in (legacy_match, indexed_match):
+                    start = time.perf_counter()
+                    result = fn(paths, urls)
+                    timings.append(time.perf_counter() - start)
+                assert legacy_match(paths, urls) == result
+                print(f"{n_csvs:>4} CSVs x {n_urls:>6} URLs: nested {timings[0] * 1000:8.1f} ms"
+                      f" | index {timings[1] * 1000:8.1f} ms")
+            for path in paths:
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
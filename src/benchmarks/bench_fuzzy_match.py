@@ -0,0 +1,125 @@
+"""
+Tiered (exact -> normalized -> canonical -> path-prefix) URL matching:
+pairwise comparison vs SerpIndex's prebuilt maps and path tries.
+
+Usage (from src/):
+    python -m benchmarks.bench_fuzzy_match [--depths 100 1000 5000] [--urls 200]
+
+For each SERP depth (rows per engine CSV) a bing and a google CSV are
+written to a temp dir; `--urls` LLM citations (a mix of exact, tracking-
+tagged, AMP/mobile, deeper-path and unrelated URLs) are then matched both
+ways and the results compared.
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from evaluators.evaluation import MATCH_TIERS, MIN_PREFIX_SEGMENTS, SerpIndex
+from evaluators.path_trie import path_segments
+from evaluators.url_normalization import canonical_parts, canonical_url, normalized_url
+
+
+def serp_urls(depth, rng):
+    hosts = [f"site{i}.com" for i in range(max(1, depth // 20))]
+    return [f"https://www.{rng.choice(hosts)}/topic/{i}/article-{i}" for i in range(depth)]
+
+
+def citations(urls, n, rng):
+    out = []
+    for i in range(n):
+        url = rng.choice(urls)
+        kind = i % 5
+        if kind == 1:
+            url += "?utm_source=chatgpt.com"
+        elif kind == 2:
+            url = url.replace("https://www.", "https://m.") + "/amp"
+        elif kind == 3:
+            url += "/comments"
+        elif kind == 4:
+            url = f"https://unrelated{i}.org/page"
+        out.append(url)
+    return out
+
+
+def write_csv(path, urls):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["Page Title", "URL"])
+        for url in urls:
+            writer.writerow(["title", url])
+
+
+def pairwise_match(csv_paths, urls):
+    # every citation against every SERP row, tier by tier
+    rows = []
+    for path in csv_paths:
+        with open(path, newline='', encoding='utf-8') as f:
+            rows.extend((path, rank, row['URL']) for rank, row in enumerate(csv.DictReader(f), start=1))
+
+    def is_prefix(serp, url):
+        s_host, s_path, _ = canonical_parts(serp)
+        u_host, u_path, _ = canonical_parts(url)
+        s_seg, u_seg = path_segments(s_path), path_segments(u_path)
+        return (s_host == u_host and len(s_seg) >= MIN_PREFIX_SEGMENTS
+                and u_seg[:len(s_seg)] == s_seg, len(s_seg))
+
+    tests = {
+        "exact": lambda serp, url: serp == url,
+        "normalized": lambda serp, url: normalized_url(serp) == normalized_url(url),
+        "canonical": lambda serp, url: canonical_url(serp) == canonical_url(url),
+    }
+    found = {}
+    for url in urls:
+        for tier in MATCH_TIERS:
+            best = {}
+            for path, rank, serp in rows:
+                if tier == "path-prefix":
+                    ok, depth = is_prefix(serp, url)
+                    if ok and (path not in best or depth > best[path][0]
+                               or (depth == best[path][0] and rank < best[path][1])):
+                        best[path] = (depth, rank)
+                elif tests[tier](serp, url) and (path not in best or rank < best[path][1]):
+                    best[path] = (0, rank)
+            if best:
+                found[url] = [(path, best[path][1], tier) for path in csv_paths if path in best]
+                break
+    return found
+
+
+def indexed_match(csv_paths, urls):
+    return SerpIndex.from_csvs(csv_paths).match(urls, csv_paths, MATCH_TIERS)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--depths', nargs='+', type=int, default=[100, 1000, 5000])
+    parser.add_argument('--urls', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        for depth in args.depths:
+            paths = []
+            for engine in ("bing", "google"):
+                path = os.path.join(tmp, f"bench_{depth}_{engine}_q.csv")
+                write_csv(path, serp_urls(depth, rng))
+                paths.append(path)
+            with open(paths[0], newline='', encoding='utf-8') as f:
+                pool = [row['URL'] for row in csv.DictReader(f)]
+            urls = citations(pool, args.urls, rng)
+            timings = []
+            results = []
+            for fn in (pairwise_match, indexed_match):
+                start = time.perf_counter()
+                results.append(fn(paths, urls))
+                timings.append(time.perf_counter() - start)
+            assert results[0] == results[1]
+            print(f"depth {depth:>5} x {args.urls} URLs: pairwise {timings[0] * 1000:9.1f} ms"
+                  f" | index (incl. CSV load) {timings[1] * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Parse HARs from the bundled zips vs from an ingested corpus.
+
+Usage (from src/):
+    python -m benchmarks.bench_har_corpus [-j N]
+
+Ingests the datasets into a temporary .harc corpus, then times
+process_har_files over the zip members and over the corpus records (the
+records must match), a raw scan of every corpus body, and random access
+to single captures.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+from chatgpt_scraper.har_corpus import HarCorpus
+from chatgpt_scraper.har_parser import CONVERSATION_URL, process_har_files
+from chatgpt_scraper.har_sources import expand_har_sources
+from chatgpt_scraper.ingest import ingest_hars
+from benchmarks._datasets import DATASETS_DIR
+
+LOOKUPS = 200
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-j', '--jobs', type=int, default=1)
+    args = parser.parse_args()
+
+    archives = sorted(os.path.join(DATASETS_DIR, n) for n in os.listdir(DATASETS_DIR) if n.endswith('.zip'))
+    sources = expand_har_sources(archives, absolute=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_path = os.path.join(tmp, 'bench.harc')
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ingest_hars(corpus_path, sources, workers=args.jobs)
+        ingest_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from_zip = process_har_files(sources, CONVERSATION_URL, workers=args.jobs)
+        zip_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        from_corpus = process_har_files(expand_har_sources([corpus_path]), CONVERSATION_URL, workers=args.jobs)
+        corpus_time = time.perf_counter() - start
+
+        def strip(records):
+            return [{k: v for k, v in r.items() if k != 'harname'} for r in records]
+        assert strip(from_zip) == strip(from_corpus), "corpus records differ from the HARs"
+
+        with HarCorpus(corpus_path) as corpus:
+            start = time.perf_counter()
+            body_bytes = sum(len(entry['content_text']) for _, entry in corpus)
+            scan_time = time.perf_counter() - start
+
+            keys = random.Random(0).choices(corpus.keys(), k=LOOKUPS)
+            start = time.perf_counter()
+            for key in keys:
+                corpus.entry(key)
+            lookup_ms = (time.perf_counter() - start) / LOOKUPS * 1000
+        corpus_size = os.path.getsize(corpus_path)
+
+    zip_size = sum(os.path.getsize(a) for a in archives)
+    print(f"{len(sources)} HARs; zips {zip_size / 1e6:.1f} MB, corpus {corpus_size / 1e6:.1f} MB "
+          f"(ingested in {ingest_time:.2f}s)")
+    print(f"  process_har_files  zip members {zip_time:6.2f}s | corpus {corpus_time:6.2f}s")
+    print(f"  corpus scan        {body_bytes / 1e6:.1f} MB of SSE bodies in {scan_time:.3f}s")
+    print(f"  random access      {lookup_ms:.2f} ms per capture")
+
+
+if __name__ == "__main__":
+    main()
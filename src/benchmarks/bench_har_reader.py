@@ -0,0 +1,63 @@
+"""
+Compare the streaming HAR reader against a whole-document json.load.
+
+Usage (from src/):
+    python -m benchmarks.bench_har_reader [--limit N]
+
+Reports wall time and peak traced memory for locating the conversation
+entry in every HAR of the bundled datasets.
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+from chatgpt_scraper.har_stream import iter_har_entries, url_equals
+from benchmarks._datasets import extracted_hars
+
+TARGET = "https://chatgpt.com/backend-api/f/conversation"
+
+
+def load_whole(har_path):
+    with open(har_path, 'r', encoding='utf-8') as f:
+        har = json.load(f)
+    entries = har.get('entries') or har.get('log', {}).get('entries', [])
+    return next((e for e in entries if e.get('request', {}).get('url') == TARGET), None)
+
+
+def load_streaming(har_path):
+    with open(har_path, 'r', encoding='utf-8') as f:
+        return next(iter_har_entries(f, url_equals(TARGET)), None)
+
+
+def measure(fn, paths):
+    start = time.perf_counter()
+    for p in paths:
+        fn(p)
+    elapsed = time.perf_counter() - start
+
+    # peak is per file, so reset between HARs
+    peak = 0
+    tracemalloc.start()
+    for p in paths:
+        tracemalloc.reset_peak()
+        fn(p)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--limit', type=int, default=0, help='Only use the first N HARs')
+    args = parser.parse_args()
+
+    with extracted_hars(args.limit) as paths:
+        print(f"{len(paths)} HAR files")
+        for name, fn in (("json.load", load_whole), ("streaming", load_streaming)):
+            elapsed, peak = measure(fn, paths)
+            print(f"{name:>10}: {elapsed:7.3f} s total, peak {peak / 2**20:7.2f} MiB per file")
+
+
+if __name__ == "__main__":
+    main()
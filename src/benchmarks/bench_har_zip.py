@@ -0,0 +1,61 @@
+"""
+Parse the bundled datasets in place vs extracting them to disk first.
+
+Usage (from src/):
+    python -m benchmarks.bench_har_zip [-j N]
+
+"extract" is the old workflow (unzip every HAR to a scratch directory,
+then parse the files); "in place" streams each member out of the zips via
+the `archive.zip` --har-files syntax. Both must give the same records.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+
+from chatgpt_scraper.har_parser import process_har_files
+from chatgpt_scraper.har_sources import expand_har_sources
+from benchmarks._datasets import DATASETS_DIR
+
+TARGET = "https://chatgpt.com/backend-api/f/conversation"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-j', '--jobs', type=int, default=1)
+    args = parser.parse_args()
+
+    archives = sorted(os.path.join(DATASETS_DIR, n) for n in os.listdir(DATASETS_DIR) if n.endswith('.zip'))
+
+    tmp = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        paths = []
+        for archive in archives:
+            with zipfile.ZipFile(archive) as zf:
+                paths.extend(zf.extract(m, tmp) for m in zf.namelist() if m.endswith('.har'))
+        paths.sort()
+        extract_time = time.perf_counter() - start
+        extracted = process_har_files(paths, TARGET, workers=args.jobs)
+        extracted_time = time.perf_counter() - start
+        footprint = sum(os.path.getsize(p) for p in paths)
+    finally:
+        shutil.rmtree(tmp)
+
+    start = time.perf_counter()
+    in_place = process_har_files(expand_har_sources(archives), TARGET, workers=args.jobs)
+    in_place_time = time.perf_counter() - start
+
+    def strip(records):
+        return [{k: v for k, v in r.items() if k != 'harname'} for r in records]
+    assert strip(extracted) == strip(in_place), "archive members parsed differently"
+
+    print(f"{len(paths)} HARs from {len(archives)} archives, {footprint / 1e6:.1f} MB extracted")
+    print(f"  extract + parse {extracted_time:6.2f}s (extract {extract_time:.2f}s)")
+    print(f"  in place        {in_place_time:6.2f}s (0 MB written)")
+
+
+if __name__ == "__main__":
+    main()
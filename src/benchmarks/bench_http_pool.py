@@ -0,0 +1,151 @@
+"""
+Per-request latency with and without the pooled SERP HTTP client.
+
+Usage (from src/):
+    python -m benchmarks.bench_http_pool [--requests N] [--delay-ms D] [--plain]
+
+Starts a local HTTPS/1.1 stub standing in for serper.dev / WebScrapingAPI
+and times the same calls made with a fresh connection each time (the old
+path: one http.client.HTTPSConnection per Bing page, a bare requests.post
+per Google page) and over serp_scrapers.http_client. The stub uses a
+self-signed certificate made with the openssl CLI at start-up, so every
+fresh connection pays a real TLS handshake as API calls do. --plain runs
+the stub over plain HTTP instead.
+"""
+import argparse
+import http.client
+import json
+import os
+import ssl
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from serp_scrapers import http_client
+
+BODY = json.dumps({"organic": [{"title": f"t{i}", "link": f"https://example.com/{i}"}
+                               for i in range(50)]}).encode("utf-8")
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    delay = 0.0
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if self.delay:
+            time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+def make_cert(directory):
+    """Self-signed certificate and key for 127.0.0.1; returns (cert path, key path)."""
+    cert, key = os.path.join(directory, "stub.pem"), os.path.join(directory, "stub.key")
+    subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                    "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+                    "-keyout", key, "-out", cert],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return cert, key
+
+
+def start_stub(delay, cert=None):
+    StubHandler.delay = delay
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    if cert is not None:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(*cert)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fresh_http_client(host, port, context):
+    """The old fetch_bing_results: a new (HTTPS)Connection per page."""
+    if context is None:
+        conn = http.client.HTTPConnection(host, port)
+    else:
+        conn = http.client.HTTPSConnection(host, port, context=context)
+    conn.request("GET", "/v2?q=x")
+    conn.getresponse().read()
+    conn.close()
+
+
+def fresh_requests(url, verify):
+    """The old fetch_serper_page: a bare requests.post per page."""
+    requests.post(url, json={"q": "x"}, timeout=10, verify=verify).content
+
+
+def pooled_get(url, verify):
+    """fetch_bing_results now."""
+    http_client.request("GET", url, params={"q": "x"}, verify=verify).content
+
+
+def pooled_post(url, verify):
+    """fetch_serper_page now."""
+    http_client.request("POST", url, json={"q": "x"}, verify=verify).content
+
+
+def timings(fn, n):
+    out = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - start) * 1000)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--delay-ms', type=float, default=0.0, help='Server-side think time per request')
+    parser.add_argument('--plain', action='store_true', help='Plain HTTP stub (no TLS handshakes)')
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    cert = None if args.plain else make_cert(tmp.name)
+    server = start_stub(args.delay_ms / 1000, cert)
+    host, port = server.server_address
+    base = f"{'http' if args.plain else 'https'}://{host}:{port}"
+    # verify against the stub's own certificate, as the real clients verify the APIs'
+    context = None if args.plain else ssl.create_default_context(cafile=cert[0])
+    verify = True if args.plain else cert[0]
+    variants = [
+        ("Bing: http.client, new conn", lambda: fresh_http_client(host, port, context)),
+        ("Bing: pooled session GET", lambda: pooled_get(f"{base}/v2", verify)),
+        ("Google: requests.post, new conn", lambda: fresh_requests(f"{base}/search", verify)),
+        ("Google: pooled session POST", lambda: pooled_post(f"{base}/search", verify)),
+    ]
+    print(f"{args.requests} requests per variant over {'HTTP' if args.plain else 'HTTPS'}")
+    try:
+        for name, fn in variants:
+            fn()  # warm-up
+            ms = timings(fn, args.requests)
+            p95 = sorted(ms)[int(len(ms) * 0.95) - 1]
+            print(f"{name:>32}: mean {statistics.mean(ms):6.2f} ms, "
+                  f"p50 {statistics.median(ms):6.2f} ms, p95 {p95:6.2f} ms")
+    finally:
+        server.shutdown()
+        http_client.close_session()
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
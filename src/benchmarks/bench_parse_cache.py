@@ -0,0 +1,52 @@
+"""
+HAR parsing with and without the persistent parse cache.
+
+Usage (from src/):
+    python -m benchmarks.bench_parse_cache [-j N] [--slim]
+
+Times parsing every bundled HAR with no cache, into an empty cache (cold),
+from the cache (warm: only the mtime/size check and a lookup per file) and
+after touching every file (content hashed again, records reused). All
+runs must return the same records. --slim parses as main.py does by
+default (records without SSE bodies, so smaller cache payloads).
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from chatgpt_scraper.har_parser import CONVERSATION_URL, process_har_files
+from chatgpt_scraper.parse_cache import ParseCache
+from benchmarks._datasets import extracted_hars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-j', '--jobs', type=int, default=1)
+    parser.add_argument('--slim', action='store_true')
+    args = parser.parse_args()
+
+    with extracted_hars() as paths, tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(os.path.join(tmp, 'parse_cache.sqlite3'))
+
+        def timed(use_cache):
+            start = time.perf_counter()
+            records = process_har_files(paths, CONVERSATION_URL, workers=args.jobs,
+                                        cache=cache if use_cache else None, slim=args.slim)
+            return records, time.perf_counter() - start
+
+        baseline, uncached = timed(False)
+        cold_records, cold = timed(True)
+        warm_records, warm = timed(True)
+        for p in paths:
+            os.utime(p)
+        touched_records, touched = timed(True)
+        cache.close()
+
+    assert baseline == cold_records == warm_records == touched_records, "cached records differ"
+    print(f"{len(paths)} HARs")
+    print(f"  no cache {uncached:6.2f}s | cold {cold:6.2f}s | warm {warm:6.2f}s | touched (rehash) {touched:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
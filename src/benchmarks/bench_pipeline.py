@@ -0,0 +1,76 @@
+"""
+Staged pipeline vs the old strictly sequential main.py flow.
+
+Usage (from src/):
+    python -m benchmarks.bench_pipeline [--hars 20] [--parse-ms 40] [--page-ms 30] [--eval-ms 40]
+
+Stages are simulated with sleeps: parsing one HAR, fetching one SERP page
+(through a real SerpRunner with a fake engine) and evaluating one HAR.
+Sequential = parse all, then fetch all jobs concurrently, then evaluate
+all; the pipeline overlaps the three.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import tempfile
+import time
+
+from pipeline import run_pipeline
+from serp_scrapers import async_runner
+from serp_scrapers.async_runner import EngineLimits, SerpJob, SerpRunner
+
+QUERIES_PER_HAR = 3
+PAGES = 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hars', type=int, default=20)
+    parser.add_argument('--parse-ms', type=float, default=40)
+    parser.add_argument('--page-ms', type=float, default=30)
+    parser.add_argument('--eval-ms', type=float, default=40)
+    args = parser.parse_args()
+
+    def fetch(query, page, size):
+        time.sleep(args.page_ms / 1000)
+        return [(f"{query} {page} {i}", f"https://e.com/{query}/{page}/{i}") for i in range(size)]
+
+    async_runner.ENGINES['bench'] = async_runner.ENGINES['google']._replace(fetch=fetch, api_key_env='')
+    limits = {'bench': EngineLimits(concurrency=8, rate=0)}
+
+    def parse():
+        for n in range(args.hars):
+            time.sleep(args.parse_ms / 1000)
+            yield {'harname': f"har{n}.har", 'search_strings': [f"q{n}-{k}" for k in range(QUERIES_PER_HAR)]}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def plan(entry):
+            return [SerpJob('bench', q, f"{tmp}/{q}.csv", PAGES * 10, 10, entry['harname'])
+                    for q in entry['search_strings']]
+
+        def evaluate(entry, jobs, written):
+            time.sleep(args.eval_ms / 1000)
+
+        # the runner prints a line per job
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            entries = list(parse())
+            jobs = [job for entry in entries for job in plan(entry)]
+            asyncio.run(SerpRunner(limits).run(jobs))
+            for entry in entries:
+                evaluate(entry, None, None)
+            sequential = time.perf_counter() - start
+
+            start = time.perf_counter()
+            run_pipeline(parse(), plan, evaluate, SerpRunner(limits), ['bench'])
+            pipelined = time.perf_counter() - start
+
+    fetch_floor = args.hars * QUERIES_PER_HAR * PAGES * args.page_ms / 1000 / limits['bench'].concurrency
+    print(f"{args.hars} HARs: parse {args.hars * args.parse_ms / 1000:.2f}s, "
+          f"fetch >= {fetch_floor:.2f}s, evaluate {args.hars * args.eval_ms / 1000:.2f}s of work")
+    print(f"  sequential {sequential:6.2f}s | pipeline {pipelined:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Selenium Bing scraping: a fresh Chrome per page vs the warmed DriverPool.
+
+Usage (from src/):
+    python -m benchmarks.bench_selenium_pool [--pages 6] [--pool 3] [--pages-per-driver 5]
+
+Starts a local static server standing in for Bing: /search?q=..&first=N
+returns a page of `li.b_algo` results, ten per page, with a short last
+page. Both runs scrape the same query against it with no politeness delay
+and must return the same results. Needs Chrome plus selenium and
+webdriver_manager.
+"""
+import argparse
+import contextlib
+import html
+import io
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from serp_scrapers import bing_scraper_sel
+from serp_scrapers.bing_scraper_sel import DriverPool, new_driver, scrape_page, scrape_bing
+
+
+class BingStub(BaseHTTPRequestHandler):
+    total_results = 0
+
+    def do_GET(self):
+        params = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+        query = params.get("q", [""])[0]
+        first = int(params.get("first", ["1"])[0])
+        items = "".join(
+            f'<li class="b_algo"><h2><a href="https://example.com/{n}">{html.escape(query)} {n}</a></h2>'
+            f'<p>snippet {n}</p></li>'
+            for n in range(first, min(first + 10, self.total_results + 1)))
+        body = f'<html><body><ol id="b_results">{items}</ol></body></html>'.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub(total_results):
+    BingStub.total_results = total_results
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BingStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def scrape_fresh(query, base_url):
+    """The old flow: one new Chrome (and driver lookup) per page, pages in sequence."""
+    results = []
+    page = 1
+    while True:
+        bing_scraper_sel.driver_path.cache_clear()
+        driver = new_driver()
+        try:
+            page_results, n_items = scrape_page(driver, query, page, base_url)
+        finally:
+            driver.quit()
+        results.extend(page_results)
+        if n_items < bing_scraper_sel.RESULTS_PER_PAGE:
+            return results
+        page += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=6)
+    parser.add_argument('--pool', type=int, default=3)
+    parser.add_argument('--pages-per-driver', type=int, default=5)
+    args = parser.parse_args()
+
+    server = start_stub(args.pages * 10 - 5)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/search"
+    query = "driver pool"
+
+    # the scraper logs every step
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        fresh = scrape_fresh(query, base_url)
+        fresh_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with DriverPool(args.pool, pages_per_driver=args.pages_per_driver) as pool:
+            warm_time = time.perf_counter() - start
+            pooled = scrape_bing(query, pool=pool, base_url=base_url, delay_range=None)
+            recycled = pool.recycled
+        pooled_time = time.perf_counter() - start
+    server.shutdown()
+
+    assert pooled == fresh, "pooled results differ from per-page drivers"
+    print(f"{args.pages} pages, {len(fresh)} results")
+    print(f"  fresh driver per page {fresh_time:6.2f}s")
+    print(f"  pool of {args.pool}          {pooled_time:6.2f}s "
+          f"(warm-up {warm_time:.2f}s, {recycled} drivers recycled)")
+
+
+if __name__ == "__main__":
+    main()
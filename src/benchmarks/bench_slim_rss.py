@@ -0,0 +1,63 @@
+"""
+Peak RSS of a large har_parser batch with and without slim records.
+
+Usage (from src/):
+    python -m benchmarks.bench_slim_rss [--repeat 5] [-j N]
+
+Parses every bundled HAR `--repeat` times (streamed from the zips) and
+keeps the records, as har_parser's returned list does. Each mode runs in
+a fresh interpreter so the peaks are independent (ru_maxrss, Linux/macOS).
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from chatgpt_scraper.har_parser import CONVERSATION_URL, process_har_files
+from chatgpt_scraper.har_sources import expand_har_sources
+from benchmarks._datasets import DATASETS_DIR
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def child(slim: bool, repeat: int, jobs: int) -> None:
+    archives = sorted(os.path.join(DATASETS_DIR, n) for n in os.listdir(DATASETS_DIR) if n.endswith('.zip'))
+    sources = expand_har_sources(archives) * repeat
+    start = time.perf_counter()
+    records = process_har_files(sources, CONVERSATION_URL, workers=jobs, slim=slim)
+    elapsed = time.perf_counter() - start
+    body = sum(len(r['metrics'].get('content_text') or '') for r in records if 'metrics' in r)
+    print(f"{len(records)} {elapsed:.2f} {body / 1e6:.1f} {peak_rss_mb():.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('-j', '--jobs', type=int, default=1)
+    parser.add_argument('--child', choices=['full', 'slim'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child == 'slim', args.repeat, args.jobs)
+        return
+
+    results = {}
+    for mode in ('full', 'slim'):
+        out = subprocess.run([sys.executable, '-m', 'benchmarks.bench_slim_rss', '--child', mode,
+                              '--repeat', str(args.repeat), '-j', str(args.jobs)],
+                             capture_output=True, text=True, check=True).stdout.split()
+        results[mode] = out
+    n = results['full'][0]
+    print(f"{n} records kept in memory")
+    for mode, (_, elapsed, body, peak) in results.items():
+        print(f"  {mode:4}  peak RSS {float(peak):7.1f} MB | bodies retained {float(body):6.1f} MB | {float(elapsed):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
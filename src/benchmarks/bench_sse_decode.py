@@ -0,0 +1,74 @@
+"""
+SSE payload decode throughput per JSON backend.
+
+Usage (from src/):
+    python -m benchmarks.bench_sse_decode [--limit N] [--repeat R]
+
+Decodes every ``data:`` payload of the conversation entries in the bundled
+datasets and reports MB/s of SSE body processed per backend, against the
+original stdlib try/except path, with and without the extraction
+pre-filter that skips events which cannot matter.
+"""
+import argparse
+import json
+import time
+
+from chatgpt_scraper.har_parser import EXTRACTION_MARKERS, iter_sse_events
+from chatgpt_scraper.har_stream import iter_har_entries, url_equals
+from chatgpt_scraper.json_backend import available_backends, make_payload_decoder
+from benchmarks._datasets import extracted_hars
+
+TARGET = "https://chatgpt.com/backend-api/f/conversation"
+
+
+def stdlib_try_except(data_str):
+    try:
+        return json.loads(data_str)
+    except json.JSONDecodeError:
+        return data_str
+
+
+def load_bodies(paths):
+    bodies = []
+    for p in paths:
+        with open(p, 'r', encoding='utf-8') as f:
+            entry = next(iter_har_entries(f, url_equals(TARGET)), None)
+        if entry:
+            bodies.append(entry['response']['content'].get('text') or '')
+    return bodies
+
+
+def throughput(decode, bodies, repeat, prefilter=None):
+    size_mb = sum(len(b.encode('utf-8')) for b in bodies) / 1e6
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decoded = 0
+        for body in bodies:
+            for _ev in iter_sse_events(body, decode, prefilter):
+                decoded += 1
+        best = min(best, time.perf_counter() - start)
+    return size_mb / best, best, decoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--limit', type=int, default=0, help='Only use the first N HARs')
+    parser.add_argument('--repeat', type=int, default=3, help='Best-of-R timing')
+    args = parser.parse_args()
+
+    with extracted_hars(args.limit) as paths:
+        bodies = load_bodies(paths)
+    print(f"{len(bodies)} SSE bodies, {sum(map(len, bodies)) / 1e6:.1f} M chars")
+
+    variants = [("json try/except (original)", stdlib_try_except, None)]
+    for backend in available_backends():
+        variants.append((backend, make_payload_decoder(backend), None))
+        variants.append((f"{backend} + prefilter", make_payload_decoder(backend), EXTRACTION_MARKERS))
+    for name, decode, prefilter in variants:
+        mbps, secs, decoded = throughput(decode, bodies, args.repeat, prefilter)
+        print(f"{name:>28}: {mbps:7.1f} MB/s ({secs:.3f} s, {decoded} events decoded)")
+
+
+if __name__ == "__main__":
+    main()
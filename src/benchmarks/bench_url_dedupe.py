@@ -0,0 +1,68 @@
+"""
+Micro-benchmark for URL dedupe + cited/normal split.
+
+Usage (from src/):
+    python -m benchmarks.bench_url_dedupe [--sizes 10000 100000] [--legacy-max 20000]
+
+Compares the old list-membership dedupe with the UrlCollector-backed one
+on synthetic URL lists (about a quarter duplicates, some utm-cited).
+"""
+import argparse
+import random
+import time
+
+from chatgpt_scraper.har_parser import split_cited_urls
+
+
+def legacy_split(all_urls):
+    normal_urls = []
+    cited_urls = []
+    for u in all_urls:
+        if u in normal_urls or u in cited_urls:
+            continue
+        if 'utm_source=chatgpt.com' in u:
+            cited_urls.append(u)
+        else:
+            normal_urls.append(u)
+    return normal_urls, cited_urls
+
+
+def synthetic_urls(n, seed=0):
+    rng = random.Random(seed)
+    unique = n * 3 // 4 or 1
+    urls = []
+    for _ in range(n):
+        i = rng.randrange(unique)
+        suffix = "?utm_source=chatgpt.com" if i % 5 == 0 else ""
+        urls.append(f"https://site{i % 997}.example.com/articles/{i}{suffix}")
+    return urls
+
+
+def timed(fn, urls):
+    start = time.perf_counter()
+    result = fn(urls)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 100_000])
+    parser.add_argument('--legacy-max', type=int, default=20_000,
+                        help='Skip the quadratic implementation above this size')
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        urls = synthetic_urls(n)
+        new_t, new_res = timed(split_cited_urls, urls)
+        line = f"{n:>8} URLs: collector {new_t * 1000:9.2f} ms"
+        if n <= args.legacy_max:
+            old_t, old_res = timed(legacy_split, urls)
+            assert old_res == new_res
+            line += f" | list scan {old_t * 1000:10.2f} ms ({old_t / new_t:,.0f}x)"
+        else:
+            line += " | list scan skipped"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+URL normalization throughput: the old urlparse + suffix heuristic vs the
+memoized normalizers.
+
+Usage (from src/):
+    python -m benchmarks.bench_url_normalize [--urls 1000000] [--distinct 50000]
+
+`--urls` lookups are drawn from `--distinct` synthetic URLs (SERP rows and
+LLM citations repeat heavily); the cold pass normalizes every distinct URL
+once with empty caches. Target: >= 1M URLs/minute.
+"""
+import argparse
+import random
+import time
+import urllib.parse
+
+from evaluators import url_normalization
+from evaluators.url_normalization import canonical_parts, canonical_url, normalized_url, registrable_url
+
+HOSTS = ["www.dell.com", "support.microsoft.com", "www.bbc.co.uk", "news.yahoo.co.jp",
+         "example.com.au", "shop.example.co.za", "user.github.io", "foo.blogspot.com",
+         "www.amazon.de", "m.facebook.com", "docs.python.org", "forum.example.com.br"]
+QUERIES = ["", "?lang=en-us", "?guid=abc&lang=en-us&utm_source=chatgpt.com",
+           "?utm_source=x&utm_medium=y&gclid=123", "?id=42&fbclid=xyz", "?q=a+b&page=2"]
+
+
+def legacy_normalize_url(url):
+    # the pre-module evaluation.normalize_url
+    p = urllib.parse.urlparse(url.strip())
+    host = (p.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    host = host.split(':')[0]
+    parts = host.split('.')
+    suffix_inds = {"co", "com", "net", "org", "gov", "ac", "edu"}
+    if len(parts) >= 3 and parts[-1].isalpha() and len(parts[-1]) <= 3 and parts[-2] in suffix_inds:
+        core = parts[-3]
+    elif len(parts) >= 2:
+        core = parts[-2]
+    else:
+        core = parts[0]
+    return core, p.path.rstrip('/')
+
+
+def make_urls(n, rng):
+    return [f"https://{rng.choice(HOSTS)}/section/{i}/page/{rng.choice(QUERIES)}" for i in range(n)]
+
+
+def clear_caches():
+    normalized_url.cache_clear()
+    canonical_parts.cache_clear()
+    registrable_url.cache_clear()
+
+
+def rate(n, seconds):
+    return f"{n / seconds * 60 / 1e6:6.2f}M URLs/min"
+
+
+def time_pass(fn, urls):
+    start = time.perf_counter()
+    for url in urls:
+        fn(url)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--urls', type=int, default=1_000_000)
+    parser.add_argument('--distinct', type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    distinct = make_urls(args.distinct, rng)
+    stream = [rng.choice(distinct) for _ in range(args.urls)]
+
+    print(f"{args.urls} lookups over {args.distinct} distinct URLs")
+    for name, fn in (("legacy normalize_url", legacy_normalize_url),
+                     ("normalized_url", normalized_url),
+                     ("canonical_url", canonical_url),
+                     ("registrable_url", registrable_url)):
+        clear_caches()
+        cold = time_pass(fn, distinct)
+        total = time_pass(fn, stream)
+        print(f"  {name:<22} cold {rate(len(distinct), cold)} | mixed stream {rate(len(stream), total)}")
+
+    print(url_normalization.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Compressed, indexed corpus of conversation entries extracted from HARs.
+
+Re-parsing a 0.5-1 MB HAR only to reach one entry is wasted work once the
+entry is known. A corpus keeps, per HAR, the parse_entry() metrics and the
+raw SSE body (content_text), each zlib-compressed on its own, so a record's
+metrics can be read without inflating its body.
+
+Layout of a .harc file:
+    MAGIC
+    record*   zlib(metrics JSON) zlib(body UTF-8)
+    index     zlib(JSON {"version", "target_url", "records": [[key, offset, metrics_len, body_len], ...]})
+    trailer   index offset (u64), index length (u64), END_MAGIC
+The index maps each key (the HAR source it was ingested from) to its
+offset, so one capture is a seek plus two small inflates, and scanning
+reads the records front to back. Adding records builds the new file next
+to the old one (old records, new records, then the new index) and swaps
+it in on close, so an interrupted ingest leaves the old corpus intact.
+"""
+import json
+import os
+import shutil
+import struct
+import threading
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+CORPUS_SUFFIX = '.harc'
+FORMAT_VERSION = 1
+
+MAGIC = b'HARC1\n'
+END_MAGIC = b'HARCEND\n'
+_TRAILER = struct.Struct('<QQ')
+_TRAILER_SIZE = _TRAILER.size + len(END_MAGIC)
+_PREAD = getattr(os, 'pread', None)     # not on Windows, where pool workers are spawned anyway
+
+# —— Configuration —— #
+COMPRESSION_LEVEL = 6
+OPEN_CORPORA      = 4      # corpora kept open per process by open_corpus()
+# ———————— #
+
+
+class IndexEntry(NamedTuple):
+    offset: int
+    metrics_len: int
+    body_len: int
+
+
+def compress_record(metrics: Dict[str, Any]) -> Tuple[bytes, bytes]:
+    """(metrics blob, body blob) of a parse_entry() result; content_text goes in the body."""
+    meta = {k: v for k, v in metrics.items() if k != 'content_text'}
+    body = metrics.get('content_text') or ''
+    return (zlib.compress(json.dumps(meta, ensure_ascii=False).encode('utf-8'), COMPRESSION_LEVEL),
+            zlib.compress(body.encode('utf-8'), COMPRESSION_LEVEL))
+
+
+class HarCorpus:
+    """Read side of a corpus. Use as a context manager, or call close()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, 'rb')
+        self._lock = threading.Lock()
+        try:
+            self.target_url, self._index = self._read_index()
+        except Exception:
+            self._f.close()
+            raise
+
+    def _read_index(self) -> Tuple[Optional[str], Dict[str, IndexEntry]]:
+        if self._f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{self.path} is not a HAR corpus")
+        self._f.seek(0, os.SEEK_END)
+        if self._f.tell() < len(MAGIC) + _TRAILER_SIZE:
+            raise ValueError(f"Truncated HAR corpus: {self.path}")
+        self._f.seek(-_TRAILER_SIZE, os.SEEK_END)
+        trailer = self._f.read(_TRAILER_SIZE)
+        if trailer[_TRAILER.size:] != END_MAGIC:
+            raise ValueError(f"Truncated HAR corpus (no index): {self.path}")
+        offset, length = _TRAILER.unpack(trailer[:_TRAILER.size])
+        self._f.seek(offset)
+        index = json.loads(zlib.decompress(self._f.read(length)))
+        if index.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported HAR corpus version {index.get('version')} in {self.path}")
+        self.index_offset = offset
+        return index.get('target_url'), {key: IndexEntry(*pos) for key, *pos in index['records']}
+
+    def keys(self) -> List[str]:
+        """Keys in file order."""
+        return sorted(self._index, key=lambda k: self._index[k].offset)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _read(self, key: str, body: bool) -> Tuple[Dict[str, Any], Optional[str]]:
+        pos = self._index.get(key)
+        if pos is None:
+            raise KeyError(f"No record '{key}' in {self.path}")
+        data = self._pread(pos.offset, pos.metrics_len + (pos.body_len if body else 0))
+        metrics = json.loads(zlib.decompress(data[:pos.metrics_len]))
+        text = zlib.decompress(data[pos.metrics_len:]).decode('utf-8') if body else None
+        return metrics, text
+
+    def _pread(self, offset: int, length: int) -> bytes:
+        # positional read: no shared file offset, so threads and forked
+        # workers that inherited this reader cannot interleave seeks
+        if _PREAD is not None:
+            return _PREAD(self._f.fileno(), length, offset)
+        with self._lock:
+            self._f.seek(offset)
+            return self._f.read(length)
+
+    def metrics(self, key: str) -> Dict[str, Any]:
+        """parse_entry() metrics without content_text; the body is not inflated."""
+        return self._read(key, body=False)[0]
+
+    def body(self, key: str) -> str:
+        return self.entry(key)['content_text']
+
+    def entry(self, key: str) -> Dict[str, Any]:
+        """The full parse_entry() result, content_text included."""
+        metrics, text = self._read(key, body=True)
+        metrics['content_text'] = text
+        return metrics
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(key, entry) for every record, reading the file sequentially."""
+        for key in self.keys():
+            yield key, self.entry(key)
+
+    def close(self) -> None:
+        self._f.close()
+
+    def __enter__(self) -> "HarCorpus":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class CorpusWriter:
+    """
+    Append records to a corpus, creating it if needed. Records go to a
+    temporary copy that close() completes with the index and moves over
+    `path`; until then readers keep seeing the old corpus. Leaving the
+    `with` block on an exception calls abort() instead, dropping the copy.
+    """
+
+    def __init__(self, path: str, target_url: str):
+        self.path = path
+        self.target_url = target_url
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self._index: Dict[str, IndexEntry] = {}
+        if os.path.exists(path):
+            with HarCorpus(path) as corpus:
+                if corpus.target_url != target_url:
+                    raise ValueError(f"{path} holds entries for {corpus.target_url}, not {target_url}")
+                self._index = dict(corpus._index)
+                end = corpus.index_offset
+            shutil.copyfile(path, self.tmp_path)
+            self._f = open(self.tmp_path, 'r+b')
+            self._f.truncate(end)
+            self._f.seek(end)
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._f = open(self.tmp_path, 'wb')
+            self._f.write(MAGIC)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, key: str, metrics_blob: bytes, body_blob: bytes) -> None:
+        """Append one compressed record (see compress_record); a key added again points at the new copy."""
+        offset = self._f.tell()
+        self._f.write(metrics_blob)
+        self._f.write(body_blob)
+        self._index[key] = IndexEntry(offset, len(metrics_blob), len(body_blob))
+
+    def close(self) -> int:
+        """Write the index and trailer and replace `path`. Returns the number of records."""
+        offset = self._f.tell()
+        index = zlib.compress(json.dumps({
+            'version': FORMAT_VERSION,
+            'target_url': self.target_url,
+            'records': [[key, *pos] for key, pos in self._index.items()],
+        }).encode('utf-8'), COMPRESSION_LEVEL)
+        self._f.write(index)
+        self._f.write(_TRAILER.pack(offset, len(index)) + END_MAGIC)
+        self._f.close()
+        os.replace(self.tmp_path, self.path)
+        return len(self._index)
+
+    def abort(self) -> None:
+        """Discard the records added since opening; `path` is left as it was."""
+        self._f.close()
+        os.remove(self.tmp_path)
+
+    def __enter__(self) -> "CorpusWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # an ingest that raised (or was interrupted) must not replace a good corpus
+        if exc[0] is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+@lru_cache(maxsize=OPEN_CORPORA)
+def _open_corpus(path: str, mtime_ns: int, size: int, pid: int) -> HarCorpus:
+    return HarCorpus(path)
+
+
+def open_corpus(path: str) -> HarCorpus:
+    """
+    Shared, cached reader for `path`; reopened when the file changes, and
+    in each process (forked parser workers get their own file handle).
+    """
+    st = os.stat(path)
+    return _open_corpus(os.path.abspath(path), st.st_mtime_ns, st.st_size, os.getpid())
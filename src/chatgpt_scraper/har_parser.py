@@ -1,6 +1,23 @@
 import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .har_corpus import open_corpus
+from .har_sources import expand_har_sources, open_har, split_corpus_ref
+from .har_stream import iter_har_entries, url_matcher
+from .json_backend import Loads, decode_payload
+from .parse_cache import ParseCache, encode_record
+from .url_collector import UrlCollector
+
+CONVERSATION_URL = "https://chatgpt.com/backend-api/f/conversation"
+# One exact URL, or request URL patterns for har_stream.url_matcher (prefix*, re:regex)
+Target = Union[str, Sequence[str]]
+# Bump whenever parsing/extraction output changes; invalidates the parse cache.
+PARSER_VERSION = 1
 
 
 def parse_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
@@ -66,60 +83,155 @@ def parse_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
     return metrics
 
 
-def parse_sse_stream(content_text: str) -> List[Dict[str, Any]]:
+# Substrings at least one of which appears in the raw data of every event
+# extract_conversation can use (search results, queries, moderation, status).
+EXTRACTION_MARKERS: Tuple[str, ...] = (
+    'search_result_group',
+    'search_queries',
+    'url_moderation',
+    'finished_successfully',
+)
+
+
+def iter_sse_events(content_text: str,
+                    decode: Optional[Loads] = None,
+                    prefilter: Optional[Sequence[str]] = None) -> Iterator[Dict[str, Any]]:
     """
-    Parse a Server-Sent Events (SSE) stream into a list of events.
+    Lazily parse a Server-Sent Events (SSE) stream, yielding one event at a time.
+    Only the current chunk is decoded, so memory is bounded by the largest event.
+    `decode` turns a data string into its payload (default: json_backend.decode_payload).
+    With `prefilter`, chunks containing none of the given substrings are dropped
+    without being decoded (their event type still carries over).
     """
-    entries: List[Dict[str, Any]] = []
+    decode = decode or decode_payload
     last_event_type: Optional[str] = None
 
-    for chunk in content_text.strip().split("\n\n"):
-        lines = chunk.splitlines()
-        event_type = None
-        data_parts: List[str] = []
+    # bounds of content_text.strip(), without copying the body
+    start = len(content_text) - len(content_text.lstrip())
+    end = len(content_text.rstrip())
 
-        for line in lines:
-            if line.startswith("event:"):
-                event_type = line.split("event:", 1)[1].strip()
-            elif line.startswith("data:"):
-                data_parts.append(line.split("data:", 1)[1].strip())
+    while True:
+        sep = content_text.find("\n\n", start, end)
+        chunk = content_text[start:sep if sep != -1 else end]
 
-        if event_type is not None:
-            last_event_type = event_type
-        event_type = event_type or last_event_type
+        if prefilter is not None and not any(m in chunk for m in prefilter):
+            # not decoded; only an event type can carry over to later chunks
+            if "event:" in chunk:
+                for line in chunk.splitlines():
+                    if line.startswith("event:"):
+                        last_event_type = line.split("event:", 1)[1].strip()
+        else:
+            lines = chunk.splitlines()
+            event_type = None
+            data_parts: List[str] = []
 
-        data_str = "".join(data_parts)
-        try:
-            payload: Any = json.loads(data_str)
-        except json.JSONDecodeError:
-            payload = data_str
+            for line in lines:
+                if line.startswith("event:"):
+                    event_type = line.split("event:", 1)[1].strip()
+                elif line.startswith("data:"):
+                    data_parts.append(line.split("data:", 1)[1].strip())
 
-        entries.append({"eventType": event_type, "payload": payload})
+            if event_type is not None:
+                last_event_type = event_type
+            event_type = event_type or last_event_type
 
-    return entries
+            data_str = "".join(data_parts)
+            yield {"eventType": event_type, "payload": decode(data_str)}
 
+        if sep == -1:
+            return
+        start = sep + 2
 
-def extract_search_queries(parsed_events: List[Dict[str, Any]]) -> List[str]:
+
+def parse_sse_stream(content_text: str, decode: Optional[Loads] = None) -> List[Dict[str, Any]]:
+    """
+    Parse a Server-Sent Events (SSE) stream into a list of events.
+    """
+    return list(iter_sse_events(content_text, decode))
+
+
+def _delta_payload(ev: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Return the payload of a delta event if it is a JSON object."""
+    if ev.get("eventType") != "delta":
+        return None
+    d = ev["payload"]
+    return d if isinstance(d, dict) else None
+
+
+def _search_queries(d: Dict[str, Any]) -> Iterator[str]:
+    """'search_queries' values appended to the message metadata by one delta."""
+    if d.get("o") != "patch" or not isinstance(d.get("v"), list):
+        return
+    for op in d["v"]:
+        if op.get("p") == "/message/metadata" and op.get("o") == "append":
+            meta = op.get("v")
+            if isinstance(meta, dict):
+                for sq in meta.get("search_queries", []):
+                    q = sq.get("q")
+                    if isinstance(q, str):
+                        yield q
+
+
+def _is_finished(d: Dict[str, Any]) -> bool:
+    return d.get("p") == "/message/status" and d.get("o") == "replace" and d.get("v") == "finished_successfully"
+
+
+def _accessed_urls(d: Dict[str, Any]) -> Iterator[str]:
+    """Search result URLs carried by one pre-response delta."""
+    # search_result_group entries embedded
+    if isinstance(d.get("v"), list):
+        for item in d["v"]:
+            if isinstance(item, dict) and item.get("type") == "search_result_group":
+                for ent in item.get("entries", []):
+                    url = ent.get("url")
+                    if url:
+                        yield url
+    # explicit entries path
+    if isinstance(d.get("p"), str) and "/search_result_groups" in d.get("p") and d.get("p").endswith("/entries"):
+        for ent in d["v"]:
+            url = ent.get("url")
+            if url:
+                yield url
+
+
+def _given_url(d: Dict[str, Any]) -> Optional[str]:
+    """URL from a post-response URL moderation delta."""
+    if d.get("type") == "url_moderation":
+        um = d.get("url_moderation_result", {}) or {}
+        return um.get("full_url") or None
+    return None
+
+
+def split_cited_urls(all_urls: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Dedupe preserving order and classify into:
+      - normal_urls  (no utm)
+      - cited_urls   (contain utm_source=chatgpt.com)
+    """
+    seen = UrlCollector()
+    normal_urls: List[str] = []
+    cited_urls: List[str] = []
+    for u in all_urls:
+        if not seen.add(u):
+            continue
+        if 'utm_source=chatgpt.com' in u:
+            cited_urls.append(u)
+        else:
+            normal_urls.append(u)
+    return normal_urls, cited_urls
+
+
+def extract_search_queries(parsed_events: Iterable[Dict[str, Any]]) -> List[str]:
     """Extract 'search_queries' values from SSE deltas."""
     queries: List[str] = []
     for ev in parsed_events:
-        if ev.get("eventType") != "delta":
-            continue
-        d = ev["payload"]
-        if not isinstance(d, dict) or d.get("o") != "patch" or not isinstance(d.get("v"), list):
-            continue
-        for op in d["v"]:
-            if op.get("p") == "/message/metadata" and op.get("o") == "append":
-                meta = op.get("v")
-                if isinstance(meta, dict):
-                    for sq in meta.get("search_queries", []):
-                        q = sq.get("q")
-                        if isinstance(q, str):
-                            queries.append(q)
+        d = _delta_payload(ev)
+        if d is not None:
+            queries.extend(_search_queries(d))
     return queries
 
 
-def extract_urls(parsed_events: List[Dict[str, Any]]) -> Tuple[List[str], List[str], List[str], List[str]]:
+def extract_urls(parsed_events: Iterable[Dict[str, Any]]) -> Tuple[List[str], List[str], List[str], List[str]]:
     """
     Walk SSE events, split into:
       - accessed URLs (pre-response)
@@ -129,110 +241,341 @@ def extract_urls(parsed_events: List[Dict[str, Any]]) -> Tuple[List[str], List[s
       - cited_urls   (contain utm_source=chatgpt.com)
     Returns (accessed, given, normal_urls, cited_urls)
     """
+    _, accessed, given, normal_urls, cited_urls = extract_conversation(parsed_events, queries=False)
+    return accessed, given, normal_urls, cited_urls
+
+
+def extract_conversation(
+    events: Iterable[Dict[str, Any]],
+    queries: bool = True,
+) -> Tuple[List[str], List[str], List[str], List[str], List[str]]:
+    """
+    Single pass over SSE events (e.g. straight from iter_sse_events) collecting
+    search queries and URLs together.
+    Returns (search_queries, accessed, given, normal_urls, cited_urls)
+    """
+    search_queries: List[str] = []
     accessed: List[str] = []
     given: List[str] = []
-    seen_sep = False
     sep_count = 0
 
-    for ev in parsed_events:
-        if ev.get("eventType") != "delta":
-            continue
-        d = ev["payload"]
-        if not isinstance(d, dict):
+    for ev in events:
+        d = _delta_payload(ev)
+        if d is None:
             continue
+        if queries:
+            search_queries.extend(_search_queries(d))
         # detect separator (second finished_successfully)
-        if d.get("p") == "/message/status" and d.get("o") == "replace" and d.get("v") == "finished_successfully":
+        if _is_finished(d):
             sep_count += 1
-            if sep_count == 2:
-                seen_sep = True
             continue
-        if not seen_sep:
-            # search_result_group entries embedded
-            if isinstance(d.get("v"), list):
-                for item in d["v"]:
-                    if isinstance(item, dict) and item.get("type") == "search_result_group":
-                        for ent in item.get("entries", []):
-                            url = ent.get("url")
-                            if url:
-                                accessed.append(url)
-            # explicit entries path
-            if isinstance(d.get("p"), str) and "/search_result_groups" in d.get("p") and d.get("p").endswith("/entries"):
-                for ent in d["v"]:
-                    url = ent.get("url")
-                    if url:
-                        accessed.append(url)
+        if sep_count < 2:
+            accessed.extend(_accessed_urls(d))
         else:
             # after second separator: URL moderation
-            if d.get("type") == "url_moderation":
-                um = d.get("url_moderation_result", {}) or {}
-                url = um.get("full_url")
-                if url:
-                    given.append(url)
-
-    # dedupe preserving order
-    all_urls = accessed + given
-    normal_urls: List[str] = []
-    cited_urls: List[str] = []
-    for u in all_urls:
-        if u in normal_urls or u in cited_urls:
-            continue
-        if 'utm_source=chatgpt.com' in u:
-            cited_urls.append(u)
+            url = _given_url(d)
+            if url:
+                given.append(url)
+
+    normal_urls, cited_urls = split_cited_urls(accessed + given)
+    return search_queries, accessed, given, normal_urls, cited_urls
+
+
+def _target_patterns(target_url: Target) -> List[str]:
+    return [target_url] if isinstance(target_url, str) else list(target_url)
+
+
+def _target_key(target_url: Target, all_turns: bool, slim: bool) -> str:
+    """Parse cache key part for a target; a single exact URL stays as is."""
+    if isinstance(target_url, str) and not all_turns and not slim:
+        return target_url
+    return json.dumps({'patterns': _target_patterns(target_url), 'all_turns': all_turns, 'slim': slim})
+
+
+def load_entries_metrics(har_path: str, target_url: Target, all_turns: bool = False) -> List[Dict[str, Any]]:
+    """
+    parse_entry() of the entries whose request URL matches `target_url`
+    (every one with `all_turns`, else the first), in file order, from one
+    pass over a HAR (path or archive member) or from a corpus record.
+    """
+    corpus_ref = split_corpus_ref(har_path)
+    if corpus_ref is not None:
+        corpus = open_corpus(corpus_ref[0])
+        if all_turns or _target_patterns(target_url) != [corpus.target_url]:
+            raise ValueError(f"{corpus_ref[0]} only holds the first entry for {corpus.target_url}")
+        return [corpus.entry(corpus_ref[1])]
+
+    # stream the capture; without all_turns stops reading at the first matching entry
+    with open_har(har_path) as f:
+        entries = iter_har_entries(f, url_matcher(target_url))
+        if all_turns:
+            matched = [parse_entry(entry) for entry in entries]
         else:
-            normal_urls.append(u)
+            first = next(entries, None)
+            matched = [parse_entry(first)] if first else []
+    if not matched:
+        raise ValueError(f"No entry with URL '{', '.join(_target_patterns(target_url))}' in {har_path}")
+    return matched
 
-    return accessed, given, normal_urls, cited_urls
 
+def load_entry_metrics(har_path: str, target_url: Target) -> Dict[str, Any]:
+    """parse_entry() of the first matching entry (see load_entries_metrics)."""
+    return load_entries_metrics(har_path, target_url)[0]
+
+
+def extract_turn(metrics: Dict[str, Any], full_decode: bool = False) -> Dict[str, Any]:
+    """Search strings, URLs and counts of one conversation entry's SSE stream."""
+    prefilter = None if full_decode else EXTRACTION_MARKERS
+    events = iter_sse_events(metrics.get('content_text') or '', prefilter=prefilter)
+
+    # search queries, urls & counts in a single pass over the stream
+    queries, accessed, given, normal_urls, cited_urls = extract_conversation(events)
 
-def process_har_files(har_list: List[str], target_url: str) -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
-    for har_path in har_list:
-        try:
-            with open(har_path, 'r', encoding='utf-8') as f:
-                har = json.load(f)
-            entries = har.get('entries') or har.get('log', {}).get('entries', [])
-            matched = next((e for e in entries if e.get('request', {}).get('url') == target_url), None)
-            if not matched:
-                raise ValueError(f"No entry with URL '{target_url}' in {har_path}")
-
-            # extract full metrics + SSE content
-            metrics = parse_entry(matched)
-            events = parse_sse_stream(metrics.get('content_text', ''))
-
-            # search queries
-            queries = extract_search_queries(events)
-            # urls & counts
-            accessed, given, normal_urls, cited_urls = extract_urls(events)
-
-            results.append({
-                'harname': har_path,
-                'search_strings': queries,
-                'url': normal_urls,
-                'cited_url': cited_urls,
-                'metrics': metrics,
-                'n_accessed': len(accessed),
-                'n_given': len(given),
-            })
-        except Exception as e:
-            results.append({'harname': har_path, 'error': str(e)})
-    return results
-
-
-def har_parser(har_list: List[str]) -> List[Dict[str, Any]]:
+    return {
+        'search_strings': queries,
+        'url': normal_urls,
+        'cited_url': cited_urls,
+        'metrics': metrics,
+        'n_accessed': len(accessed),
+        'n_given': len(given),
+    }
+
+
+def slim_metrics(metrics: Dict[str, Any]) -> Dict[str, Any]:
+    """Metrics without the SSE body; only its length (content_text_length) is kept."""
+    slim = {k: v for k, v in metrics.items() if k != 'content_text'}
+    slim['content_text_length'] = len(metrics.get('content_text') or '')
+    return slim
+
+
+def content_text(record: Dict[str, Any], target_url: Target = CONVERSATION_URL, turn: int = 0) -> str:
     """
-    Entry point: processes HAR files for the chatgpt conversation endpoint
-    and prints totals of search strings and URLs.
+    SSE body of a parsed record (of turn `turn` with all_turns). A slim
+    record no longer holds it, so it is read again from the record's
+    source, the HAR or corpus named by 'harname'.
     """
-    target = "https://chatgpt.com/backend-api/f/conversation"
-    results = process_har_files(har_list, target)
+    metrics = record['turns'][turn]['metrics'] if 'turns' in record else record['metrics']
+    if 'content_text' in metrics:
+        return metrics['content_text'] or ''
+    entries = load_entries_metrics(record['harname'], target_url, all_turns='turns' in record)
+    return entries[turn].get('content_text') or ''
 
-    # Summarize totals
-    total_searches = sum(len(r.get('search_strings', [])) for r in results if not r.get('error'))
-    total_urls = sum(len(r.get('url', [])) for r in results if not r.get('error'))
-    for r in results:
+
+def merge_turns(turns: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    One HAR-level record from per-turn records: search strings of every
+    turn, URLs deduped across turns, counts summed, the first turn's metrics.
+    """
+    urls, cited_urls = split_cited_urls([u for t in turns for u in t['url'] + t['cited_url']])
+    return {
+        'search_strings': [q for t in turns for q in t['search_strings']],
+        'url': urls,
+        'cited_url': cited_urls,
+        'metrics': turns[0]['metrics'],
+        'n_accessed': sum(t['n_accessed'] for t in turns),
+        'n_given': sum(t['n_given'] for t in turns),
+    }
+
+
+def process_har_file(har_path: str,
+                     target_url: Target,
+                     full_decode: bool = False,
+                     all_turns: bool = False,
+                     slim: bool = False) -> Dict[str, Any]:
+    """
+    Parse one HAR file (a path, archive member or corpus record, see har_sources).
+    Errors are captured in the returned record rather than raised.
+    Only SSE events that can carry queries/URLs are decoded unless `full_decode` is set.
+    With `all_turns`, every matching entry (each turn or regeneration) is
+    extracted: the record holds their merge plus a 'turns' list of per-turn records.
+    With `slim`, the SSE bodies are dropped once extracted (see slim_metrics,
+    and content_text() to read one again).
+    """
+    try:
+        # extract full metrics + SSE content
+        turns = []
+        for metrics in load_entries_metrics(har_path, target_url, all_turns):
+            turn = extract_turn(metrics, full_decode)
+            if slim:
+                turn['metrics'] = slim_metrics(metrics)
+            turns.append(turn)
+        if not all_turns:
+            return {'harname': har_path, **turns[0]}
+        return {'harname': har_path, **merge_turns(turns), 'turns': turns}
+    except Exception as e:
+        return {'harname': har_path, 'error': str(e)}
+
+
+# Cache lookups (and hashes of changed files) run this many HARs per worker ahead of the results
+CACHE_LOOKAHEAD = 4
+
+
+def _pool_size(workers: int, n_files: int) -> int:
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    return min(workers, n_files)
+
+
+def _parse_all(har_list: List[str],
+               target_url: Target,
+               workers: int,
+               full_decode: bool,
+               all_turns: bool,
+               slim: bool) -> Iterator[Dict[str, Any]]:
+    workers = _pool_size(workers, len(har_list))
+    if workers <= 1:
+        for har_path in har_list:
+            yield process_har_file(har_path, target_url, full_decode, all_turns, slim)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        task = partial(process_har_file, target_url=target_url, full_decode=full_decode,
+                       all_turns=all_turns, slim=slim)
+        yield from pool.map(task, har_list)
+
+
+def _parse_encoded(har_path: str,
+                   target_url: Target,
+                   full_decode: bool,
+                   all_turns: bool,
+                   slim: bool) -> Tuple[Dict[str, Any], Optional[bytes]]:
+    """process_har_file() plus its parse cache payload, so workers also do the compressing."""
+    record = process_har_file(har_path, target_url, full_decode, all_turns, slim)
+    return record, encode_record(record)
+
+
+def _parse_cached(har_list: List[str],
+                  target_url: Target,
+                  workers: int,
+                  full_decode: bool,
+                  cache: ParseCache,
+                  all_turns: bool,
+                  slim: bool) -> Iterator[Dict[str, Any]]:
+    """
+    iter_har_files() with a cache. Each HAR is looked up (hashed only if its
+    mtime/size changed) as the results reach it, at most CACHE_LOOKAHEAD
+    HARs per worker ahead, so the first results and the workers start at
+    once instead of after hashing every file.
+    """
+    key = _target_key(target_url, all_turns, slim)
+    task = partial(_parse_encoded, target_url=target_url, full_decode=full_decode,
+                   all_turns=all_turns, slim=slim)
+
+    def lookup(har_path):
+        digest = cache.digest(har_path)
+        record = cache.get(digest, PARSER_VERSION, key, full_decode) if digest is not None else None
+        return digest, record
+
+    def finish(digest, record, blob):
+        if digest is not None:
+            cache.put_encoded(digest, PARSER_VERSION, key, full_decode, blob)
+        return record
+
+    workers = _pool_size(workers, len(har_list))
+    if workers <= 1:
+        for har_path in har_list:
+            digest, record = lookup(har_path)
+            if record is not None:
+                yield {'harname': har_path, **record}
+            else:
+                yield finish(digest, *task(har_path))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()  # (har_path, digest, cached record or future)
+        sources = iter(har_list)
+        while True:
+            for har_path in sources:
+                digest, record = lookup(har_path)
+                pending.append((har_path, digest, record if record is not None else pool.submit(task, har_path)))
+                if len(pending) >= workers * CACHE_LOOKAHEAD:
+                    break
+            if not pending:
+                return
+            har_path, digest, result = pending.popleft()
+            if isinstance(result, dict):
+                yield {'harname': har_path, **result}
+            else:
+                yield finish(digest, *result.result())
+
+
+def iter_har_files(har_list: List[str],
+                   target_url: Target,
+                   workers: int = 1,
+                   full_decode: bool = False,
+                   cache: Optional[ParseCache] = None,
+                   all_turns: bool = False,
+                   slim: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Parse every HAR in `har_list`, yielding each result (in input order) as
+    soon as it is ready, so later stages can start before the last file.
+    Entries may be zip archives or `archive.zip:glob` member patterns; each
+    member is streamed from the archive without extracting it.
+    `target_url` is an exact URL or a list of URL patterns (see
+    har_stream.url_matcher); `all_turns` keeps every matching entry.
+    `slim` drops the SSE bodies from the records once extracted.
+    With workers > 1 (or 0 for one per CPU) files are fanned out over a process pool.
+    With a `cache`, HARs parsed before (same content, same PARSER_VERSION)
+    are served from it and only the others are parsed.
+    """
+    har_list = expand_har_sources(har_list)
+    if cache is None:
+        yield from _parse_all(har_list, target_url, workers, full_decode, all_turns, slim)
+    else:
+        yield from _parse_cached(har_list, target_url, workers, full_decode, cache, all_turns, slim)
+
+
+def process_har_files(har_list: List[str],
+                      target_url: Target,
+                      workers: int = 1,
+                      full_decode: bool = False,
+                      cache: Optional[ParseCache] = None,
+                      all_turns: bool = False,
+                      slim: bool = False) -> List[Dict[str, Any]]:
+    """Parse every HAR in `har_list`, returning results in input order."""
+    return list(iter_har_files(har_list, target_url, workers, full_decode, cache, all_turns, slim))
+
+
+def iter_har_parser(har_list: List[str],
+                    workers: int = 1,
+                    full_decode: bool = False,
+                    cache: Optional[ParseCache] = None,
+                    target_url: Target = CONVERSATION_URL,
+                    all_turns: bool = False,
+                    slim: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Streaming har_parser: yields each parsed HAR as it is ready, printing
+    its URLs and search strings, and the totals once the last one is done.
+    """
+    total_searches = 0
+    total_urls = 0
+    for r in iter_har_files(har_list, target_url, workers=workers, full_decode=full_decode, cache=cache,
+                            all_turns=all_turns, slim=slim):
+        if not r.get('error'):
+            total_searches += len(r.get('search_strings', []))
+            total_urls += len(r.get('url', []))
         print(r.get('url'))
         print(r.get('search_strings'))
+        yield r
     print(f"Total search strings across all files: {total_searches}")
     print(f"Total URLs across all files: {total_urls}")
 
-    return results
+
+def har_parser(har_list: List[str],
+               workers: int = 1,
+               full_decode: bool = False,
+               cache: Optional[ParseCache] = None,
+               target_url: Target = CONVERSATION_URL,
+               all_turns: bool = False,
+               slim: bool = False) -> List[Dict[str, Any]]:
+    """
+    Entry point: processes HAR files for the chatgpt conversation endpoint
+    (or the `target_url` patterns) and prints totals of search strings and URLs.
+    `workers` > 1 parses files in parallel processes (0 = one per CPU).
+    `full_decode` disables the SSE pre-filter (for debugging extraction).
+    `cache` (a ParseCache) skips HARs already parsed by an earlier run.
+    `all_turns` extracts every matching entry instead of the first.
+    `slim` keeps no SSE bodies in the returned records (content_text() re-reads one).
+    """
+    return list(iter_har_parser(har_list, workers=workers, full_decode=full_decode, cache=cache,
+                                target_url=target_url, all_turns=all_turns, slim=slim))
@@ -0,0 +1,180 @@
+"""
+HAR inputs that may live inside zip archives or HAR corpora.
+
+A HAR source is either a plain path or an archive reference:
+    datasets/instrumental.zip                          every .har member
+    datasets/instrumental.zip:instrumental/*/*.har     members matching a glob
+    datasets/instrumental.zip:instrumental/instrumental_hars/network-logs-prompt-1.har
+expand_har_sources() turns sources into one reference per HAR, and
+open_har() streams a member straight out of the archive (decompressed on
+the fly), so nothing is extracted to disk.
+
+Corpus files (see har_corpus) are referenced the same way,
+`corpus.harc` or `corpus.harc:<key glob>`, and expand to one reference per
+record; those hold an already extracted entry and are read with
+har_corpus.open_corpus() rather than open_har().
+
+har_keys() names each HAR for output folders and run records: the file
+stem for a plain path, archive stem plus member path for an archive
+member, so the same member name in two archives gets two keys.
+"""
+import fnmatch
+import io
+import os
+import re
+import zipfile
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from .har_corpus import CORPUS_SUFFIX, open_corpus
+
+ARCHIVE_SEP = ':'
+HAR_SUFFIX = '.har'
+
+# "<archive>.zip" optionally followed by ":<member or glob>"; the archive part may itself contain ':' (C:\...)
+_ARCHIVE_REF = re.compile(r'^(?P<archive>.*?\.zip)(?:' + ARCHIVE_SEP + r'(?P<member>.*))?$', re.I | re.S)
+_CORPUS_REF = re.compile(r'^(?P<archive>.*?' + re.escape(CORPUS_SUFFIX) + r')(?:' + ARCHIVE_SEP + r'(?P<member>.*))?$',
+                         re.I | re.S)
+_GLOB_MAGIC = re.compile(r'[*?\[]')
+
+
+def split_corpus_ref(source: str) -> Optional[Tuple[str, Optional[str]]]:
+    """(corpus, key or glob or None) for a corpus reference, else None."""
+    m = _CORPUS_REF.match(source)
+    if not m:
+        return None
+    return m.group('archive'), m.group('member') or None
+
+
+def split_archive_ref(source: str) -> Optional[Tuple[str, Optional[str]]]:
+    """(archive, member or glob or None) for an archive reference, None for a plain path."""
+    if _CORPUS_REF.match(source):
+        return None
+    m = _ARCHIVE_REF.match(source)
+    if not m:
+        return None
+    return m.group('archive'), m.group('member') or None
+
+
+def archive_ref(archive: str, member: str) -> str:
+    return f"{archive}{ARCHIVE_SEP}{member}"
+
+
+def _match_members(archive: str, names: List[str], pattern: str) -> List[str]:
+    if not _GLOB_MAGIC.search(pattern):
+        if pattern not in names:
+            raise FileNotFoundError(f"No member '{pattern}' in {archive}")
+        return [pattern]
+    return sorted(n for n in names if fnmatch.fnmatchcase(n, pattern))
+
+
+def _archive_members(archive: str, pattern: Optional[str]) -> List[str]:
+    with zipfile.ZipFile(archive) as zf:
+        names = [info.filename for info in zf.infolist() if not info.is_dir()]
+    if pattern is None:
+        return sorted(n for n in names if n.lower().endswith(HAR_SUFFIX))
+    return _match_members(archive, names, pattern)
+
+
+def _corpus_keys(corpus: str, pattern: Optional[str]) -> List[str]:
+    keys = open_corpus(corpus).keys()
+    return keys if pattern is None else _match_members(corpus, keys, pattern)
+
+
+def expand_har_sources(sources: Iterable[str], absolute: bool = False) -> List[str]:
+    """
+    One entry per HAR, in input order: plain paths unchanged, archives,
+    corpora and member globs expanded to a reference per matching member.
+    `absolute` makes the paths (not the member names) absolute.
+    """
+    expanded: List[str] = []
+    for source in sources:
+        ref = split_corpus_ref(source)
+        if ref is not None:
+            corpus, pattern = ref
+            keys = _corpus_keys(corpus, pattern)
+            if absolute:
+                corpus = os.path.abspath(corpus)
+            expanded.extend(archive_ref(corpus, key) for key in keys)
+            continue
+        ref = split_archive_ref(source)
+        if ref is None:
+            expanded.append(os.path.abspath(source) if absolute else source)
+            continue
+        archive, pattern = ref
+        if absolute:
+            archive = os.path.abspath(archive)
+        expanded.extend(archive_ref(archive, member) for member in _archive_members(archive, pattern))
+    return expanded
+
+
+def har_key(source: str) -> str:
+    """
+    Readable name of one HAR source: `capture` for .../capture.har,
+    `instrumental_hars_prompt-1` for instrumental.zip:hars/prompt-1.har.
+    A corpus record is named after the source it was ingested from.
+    """
+    ref = split_corpus_ref(source)
+    if ref is not None and ref[1] is not None:
+        return har_key(ref[1])
+    ref = split_archive_ref(source)
+    if ref is None or ref[1] is None:
+        return os.path.splitext(os.path.basename(source))[0]
+    archive, member = ref
+    stem = os.path.splitext(os.path.basename(archive))[0]
+    member = os.path.splitext(member)[0] if member.lower().endswith(HAR_SUFFIX) else member
+    return '_'.join([stem, *(part for part in re.split(r'[\\/]+', member) if part)])
+
+
+def har_keys(sources: Iterable[str]) -> Dict[str, str]:
+    """
+    har_key() of each distinct source, made unique across `sources` by
+    numbering repeats in input order (`capture`, `capture_2`, ...), so the
+    same source list always gets the same keys.
+    """
+    keys: Dict[str, str] = {}
+    taken = set()
+    for source in sources:
+        if source in keys:
+            continue
+        base = key = har_key(source)
+        n = 1
+        while key in taken:
+            n += 1
+            key = f"{base}_{n}"
+        keys[source] = key
+        taken.add(key)
+    return keys
+
+
+def source_stat(source: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of the file holding `source`: the HAR itself or its archive."""
+    ref = split_corpus_ref(source) or split_archive_ref(source)
+    st = os.stat(ref[0] if ref is not None else source)
+    return st.st_mtime_ns, st.st_size
+
+
+@contextmanager
+def open_har_bytes(source: str) -> Iterator[BinaryIO]:
+    """Like open_har(), as a binary stream."""
+    ref = split_archive_ref(source)
+    if ref is None or ref[1] is None:
+        with open(source, 'rb') as f:
+            yield f
+        return
+    archive, member = ref
+    with zipfile.ZipFile(archive) as zf, zf.open(member) as raw:
+        yield raw
+
+
+@contextmanager
+def open_har(source: str) -> Iterator[TextIO]:
+    """Open a plain HAR path or a single archive member as a text stream."""
+    ref = split_archive_ref(source)
+    if ref is None or ref[1] is None:
+        with open(source, 'r', encoding='utf-8') as f:
+            yield f
+        return
+    archive, member = ref
+    with zipfile.ZipFile(archive) as zf, zf.open(member) as raw:
+        yield io.TextIOWrapper(raw, encoding='utf-8')
@@ -0,0 +1,294 @@
+"""
+Incremental HAR reader.
+
+Walks ``log.entries`` as a stream and decodes only the entries whose request
+URL matches, so large inlined bodies of unrelated entries are never loaded.
+"""
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+# Characters read from the HAR per refill; bounds the reader's working buffer.
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Body of a JSON string up to (not including) the closing quote.
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+# Everything up to the next bracket, swallowing complete strings in one match.
+_FLAT = re.compile(r'[^\[\]{}"]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^\[\]{}"]*)*', re.S)
+# Number / true / false / null.
+_SCALAR = re.compile(r'[^,}\]\s]*')
+_WHITESPACE = re.compile(r'\s*')
+
+UrlMatcher = Callable[[Optional[str]], bool]
+
+
+class _Scanner:
+    """
+    Minimal pull scanner over a JSON text stream.
+    Values can either be skipped (never materialised) or captured and decoded.
+    """
+
+    def __init__(self, fp: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self._capture: Optional[List[str]] = None
+        self._mark = 0
+
+    def _fill(self) -> bool:
+        """Drop consumed text and read the next chunk. Returns False at EOF."""
+        if self.eof:
+            return False
+        if self._capture is not None:
+            self._capture.append(self.buf[self._mark:self.pos])
+            self._mark = 0
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+        data = self.fp.read(self.chunk_size)
+        if not data:
+            self.eof = True
+            return False
+        self.buf += data
+        return True
+
+    def _unexpected_eof(self) -> ValueError:
+        return ValueError("Unexpected end of HAR data")
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                raise self._unexpected_eof()
+
+    def expect(self, ch: str) -> None:
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"Malformed HAR: expected '{ch}', got '{got}'")
+        self.pos += 1
+
+    def skip_string(self) -> None:
+        self.pos += 1  # opening quote
+        while True:
+            end = _STRING_BODY.match(self.buf, self.pos).end()
+            if end < len(self.buf) and self.buf[end] == '"':
+                self.pos = end + 1
+                return
+            # either the buffer ran out, or it ends on a lone backslash that
+            # must be kept for the next chunk
+            self.pos = end
+            if not self._fill():
+                raise self._unexpected_eof()
+
+    def _skip_scalar(self) -> None:
+        while True:
+            self.pos = _SCALAR.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return
+
+    def skip_value(self) -> None:
+        ch = self.peek()
+        if ch == '"':
+            self.skip_string()
+            return
+        if ch not in '{[':
+            self._skip_scalar()
+            return
+        depth = 0
+        while True:
+            self.pos = _FLAT.match(self.buf, self.pos).end()
+            if self.pos == len(self.buf):
+                if not self._fill():
+                    raise self._unexpected_eof()
+                continue
+            ch = self.buf[self.pos]
+            if ch == '"':
+                # string continues past the end of the buffer
+                self.skip_string()
+                continue
+            self.pos += 1
+            if ch in '{[':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def read_raw(self) -> str:
+        """Return the JSON text of the next value without decoding it."""
+        self.peek()
+        self._capture = []
+        self._mark = self.pos
+        try:
+            self.skip_value()
+            self._capture.append(self.buf[self._mark:self.pos])
+            raw = ''.join(self._capture)
+        finally:
+            self._capture = None
+        return raw
+
+    def read_value(self) -> Any:
+        """Decode the next value."""
+        return json.loads(self.read_raw())
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Yield the keys of the next object. The caller must consume
+        (read or skip) each key's value before advancing.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError("Malformed HAR: expected object key")
+            key = self.read_value()
+            self.expect(':')
+            yield key
+            ch = self.peek()
+            self.pos += 1
+            if ch == '}':
+                return
+            if ch != ',':
+                raise ValueError(f"Malformed HAR: unexpected '{ch}' in object")
+
+    def iter_array(self) -> Iterator[None]:
+        """Yield once per element of the next array; the caller consumes each element."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield None
+            ch = self.peek()
+            self.pos += 1
+            if ch == ']':
+                return
+            if ch != ',':
+                raise ValueError(f"Malformed HAR: unexpected '{ch}' in array")
+
+
+def _read_request(scanner: _Scanner, match: UrlMatcher) -> Tuple[Dict[str, str], Optional[bool]]:
+    """
+    Capture a request block as raw per-key JSON text. Keys after a
+    non-matching URL (headers, postData, ...) are skipped.
+    """
+    request: Dict[str, str] = {}
+    matched: Optional[bool] = None
+    for key in scanner.iter_object():
+        if matched is False:
+            scanner.skip_value()
+        elif key == 'url':
+            request[key] = scanner.read_raw()
+            matched = bool(match(json.loads(request[key])))
+        else:
+            request[key] = scanner.read_raw()
+    return request, matched
+
+
+def _decode_fields(raw: Dict[str, str]) -> Dict[str, Any]:
+    return {key: json.loads(text) for key, text in raw.items()}
+
+
+def _read_entry(scanner: _Scanner, match: UrlMatcher) -> Optional[Dict[str, Any]]:
+    """
+    Decode a single HAR entry if its request URL matches, else skip it.
+    Fields are only captured as text until the URL is known, and every key
+    after a non-matching request (notably response.content.text) is skipped
+    without being materialised.
+    """
+    if scanner.peek() != '{':
+        scanner.skip_value()
+        return None
+    # fields are kept as raw text until the request URL has been seen
+    raw: Dict[str, str] = {}
+    entry: Optional[Dict[str, Any]] = None
+    matched: Optional[bool] = None
+    for key in scanner.iter_object():
+        if matched is False:
+            scanner.skip_value()
+        elif entry is not None:
+            entry[key] = scanner.read_value()
+        elif key == 'request' and scanner.peek() == '{':
+            request, matched = _read_request(scanner, match)
+            if matched:
+                entry = _decode_fields(raw)
+                entry[key] = _decode_fields(request)
+        else:
+            raw[key] = scanner.read_raw()
+    return entry
+
+
+def _iter_entries(scanner: _Scanner, match: UrlMatcher, nested: bool) -> Iterator[Dict[str, Any]]:
+    for key in scanner.iter_object():
+        if key == 'entries' and scanner.peek() == '[':
+            for _ in scanner.iter_array():
+                entry = _read_entry(scanner, match)
+                if entry is not None:
+                    yield entry
+        elif key == 'log' and not nested and scanner.peek() == '{':
+            yield from _iter_entries(scanner, match, nested=True)
+        else:
+            scanner.skip_value()
+
+
+def iter_har_entries(fp: TextIO,
+                     match: UrlMatcher,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the entries of a HAR document (``log.entries`` or top-level ``entries``)
+    and yield, in file order, only those whose request URL satisfies `match`.
+    Peak memory is bounded by `chunk_size` plus the matching entries themselves.
+    """
+    scanner = _Scanner(fp, chunk_size)
+    yield from _iter_entries(scanner, match, nested=False)
+
+
+def url_equals(target_url: str) -> UrlMatcher:
+    """Matcher for a single exact request URL."""
+    return lambda url: url == target_url
+
+
+REGEX_PREFIX = 're:'
+
+
+def url_matcher(patterns: Union[str, Iterable[str]]) -> UrlMatcher:
+    """
+    One precompiled matcher for any number of request URL patterns:
+        https://chatgpt.com/backend-api/f/conversation     exact URL
+        https://chatgpt.com/backend-api/conversation/*     prefix (trailing '*')
+        re:https://chatgpt\.com/backend-api/.*/url_safe    regex, matched from the start
+    Exact URLs are a set lookup, prefixes one str.startswith call, and all
+    regexes a single alternation.
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    exact = set()
+    prefixes: List[str] = []
+    regexes: List[str] = []
+    for pattern in patterns:
+        if pattern.startswith(REGEX_PREFIX):
+            regexes.append(pattern[len(REGEX_PREFIX):])
+        elif pattern.endswith('*'):
+            prefixes.append(pattern[:-1])
+        else:
+            exact.add(pattern)
+    if not prefixes and not regexes and len(exact) == 1:
+        return url_equals(exact.pop())
+    exact_set = frozenset(exact)
+    prefix_tuple = tuple(prefixes)
+    regex = re.compile('|'.join(f'(?:{r})' for r in regexes)).match if regexes else None
+
+    def match(url: Optional[str]) -> bool:
+        if not isinstance(url, str):
+            return False
+        return (url in exact_set
+                or (bool(prefix_tuple) and url.startswith(prefix_tuple))
+                or (regex is not None and regex(url) is not None))
+
+    return match
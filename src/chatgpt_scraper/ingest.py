@@ -0,0 +1,97 @@
+"""
+Ingest HARs into a compressed, indexed corpus (see har_corpus).
+
+Usage (from src/):
+    python -m chatgpt_scraper.ingest corpus.harc datasets/instrumental.zip more/*.har [-j N] [--force]
+
+Each HAR is read once; its conversation entry's parse_entry() metrics and
+SSE body are stored under the HAR's source reference. Afterwards the corpus
+stands in for the HARs anywhere HAR sources are accepted:
+    python main.py --har-files corpus.harc ...
+    process_har_files(expand_har_sources(['corpus.harc']), CONVERSATION_URL)
+Sources already in the corpus are skipped unless --force is given.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .har_corpus import CorpusWriter, compress_record
+from .har_parser import CONVERSATION_URL, load_entry_metrics
+from .har_sources import expand_har_sources
+
+
+class IngestStats(NamedTuple):
+    added: int
+    skipped: int
+    failed: int
+    records: int
+
+
+Extracted = Tuple[str, Optional[Tuple[bytes, bytes]], Optional[str]]
+
+
+def _extract(source: str, target_url: str) -> Extracted:
+    """(source, compressed record or None, error or None); runs in worker processes."""
+    try:
+        return source, compress_record(load_entry_metrics(source, target_url)), None
+    except Exception as e:
+        return source, None, str(e)
+
+
+def _iter_extracted(sources: List[str], target_url: str, workers: int) -> Iterator[Extracted]:
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(sources))
+    if workers <= 1:
+        for source in sources:
+            yield _extract(source, target_url)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(partial(_extract, target_url=target_url), sources)
+
+
+def ingest_hars(corpus_path: str,
+                sources: Iterable[str],
+                target_url: str = CONVERSATION_URL,
+                workers: int = 1,
+                force: bool = False) -> IngestStats:
+    """
+    Add the HARs in `sources` (paths, zip archives, `archive.zip:glob`) to
+    the corpus at `corpus_path`, creating it if needed.
+    """
+    sources = expand_har_sources(sources, absolute=True)
+    added = failed = 0
+    with CorpusWriter(corpus_path, target_url) as writer:
+        todo = [s for s in sources if force or s not in writer]
+        for source, blobs, error in _iter_extracted(todo, target_url, workers):
+            if error is not None:
+                print(f"Skipping {source}: {error}")
+                failed += 1
+                continue
+            writer.add(source, *blobs)
+            added += 1
+        records = len(writer)
+    return IngestStats(added, len(sources) - len(todo), failed, records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the conversation entry of each HAR into a corpus file")
+    parser.add_argument('corpus', help='Corpus file to create or extend (.harc)')
+    parser.add_argument('sources', nargs='+', help='HAR files, zip archives or "archive.zip:glob" patterns')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Processes used to parse HARs (0 = one per CPU)')
+    parser.add_argument('--target-url', default=CONVERSATION_URL, help='Request URL of the entry to extract')
+    parser.add_argument('--force', action='store_true', help='Re-ingest sources already in the corpus')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = ingest_hars(args.corpus, args.sources, args.target_url, args.jobs, args.force)
+    print(f"Ingested {stats.added} HARs ({stats.skipped} already present, {stats.failed} failed) "
+          f"in {time.perf_counter() - start:.2f}s; {args.corpus} holds {stats.records} records, "
+          f"{os.path.getsize(args.corpus) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Pluggable JSON decoding for SSE payloads.
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+Loads = Callable[[str], Any]
+
+_BACKENDS: Dict[str, Loads] = {'json': json.loads}
+if orjson is not None:
+    _BACKENDS['orjson'] = orjson.loads
+
+
+def available_backends() -> List[str]:
+    return sorted(_BACKENDS)
+
+
+def default_backend() -> str:
+    return 'orjson' if 'orjson' in _BACKENDS else 'json'
+
+
+def get_loads(backend: Optional[str] = None) -> Loads:
+    """Return the raw loads function for `backend` (default: fastest installed)."""
+    name = backend or default_backend()
+    if name not in _BACKENDS:
+        raise ValueError(f"JSON backend '{name}' is not available (have: {', '.join(available_backends())})")
+    return _BACKENDS[name]
+
+
+def make_payload_decoder(backend: Optional[str] = None) -> Loads:
+    """
+    Build a decoder returning the parsed JSON value, or the string itself
+    when it is not JSON (same contract as the original try/except path).
+    Values the fast backend rejects are retried with the stdlib decoder.
+    """
+    loads = get_loads(backend)
+    fast = loads is not json.loads
+
+    def decode(data_str: str) -> Any:
+        try:
+            return loads(data_str)
+        except ValueError:
+            if not fast:
+                return data_str
+        # e.g. NaN/Infinity, which only the stdlib accepts
+        try:
+            return json.loads(data_str)
+        except ValueError:
+            return data_str
+
+    return decode
+
+
+decode_payload = make_payload_decoder()
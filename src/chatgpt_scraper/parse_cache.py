@@ -0,0 +1,134 @@
+"""
+Persistent cache of parsed HARs.
+
+A parsed record (search_strings, url, cited_url, metrics, n_accessed,
+n_given) depends only on the HAR's bytes and on the parser, so it is stored
+in SQLite under (content digest, parser version, target URL, full_decode).
+Hashing a HAR still means reading it, so each source's last seen
+(mtime, size) is kept with its digest: an unchanged file is a lookup, no
+read at all. Bumping har_parser.PARSER_VERSION invalidates every record.
+Records are encoded with encode_record(), which parser worker processes
+call themselves so the main process only looks up and stores blobs.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+from .har_sources import open_har_bytes, source_stat, split_corpus_ref
+
+# —— Configuration —— #
+DEFAULT_PARSE_CACHE_FILE = "parse_cache.sqlite3"
+HASH_CHUNK               = 1 << 20
+COMPRESSION_LEVEL        = 1        # records are written once per HAR; favour speed over size
+# ———————— #
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    source   TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    digest   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    digest         TEXT NOT NULL,
+    parser_version TEXT NOT NULL,
+    target_url     TEXT NOT NULL,
+    full_decode    INTEGER NOT NULL,
+    record         BLOB NOT NULL,
+    parsed_at      REAL NOT NULL,
+    PRIMARY KEY (digest, parser_version, target_url, full_decode)
+);
+"""
+
+
+def content_digest(source: str) -> str:
+    """sha256 of a HAR's bytes (an archive member's uncompressed bytes)."""
+    h = hashlib.sha256()
+    with open_har_bytes(source) as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def encode_record(record: Dict[str, Any]) -> Optional[bytes]:
+    """Compressed cache payload of a parsed record, without 'harname'; None for records with an 'error'."""
+    if record.get('error'):
+        return None
+    payload = {k: v for k, v in record.items() if k != 'harname'}
+    return zlib.compress(json.dumps(payload, ensure_ascii=False).encode('utf-8'), COMPRESSION_LEVEL)
+
+
+class ParseCache:
+    """
+    Parsed HAR records in a SQLite file. Records are stored without their
+    'harname', which the caller sets to the source it asked for.
+    """
+
+    def __init__(self, path: str = DEFAULT_PARSE_CACHE_FILE):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.hashed = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # used by whichever thread drives the HAR iterator, one call at a time
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def digest(self, source: str) -> Optional[str]:
+        """
+        Content digest of `source`, hashing it only if its (mtime, size)
+        changed since last seen. None for sources not worth caching (corpus
+        records) or unreadable ones, which are left to the parser to report.
+        """
+        if split_corpus_ref(source) is not None:
+            return None
+        try:
+            mtime_ns, size = source_stat(source)
+        except OSError:
+            return None
+        row = self._db.execute("SELECT mtime_ns, size, digest FROM files WHERE source = ?", (source,)).fetchone()
+        if row is not None and row[0] == mtime_ns and row[1] == size:
+            return row[2]
+        try:
+            digest = content_digest(source)
+        except (OSError, KeyError):  # KeyError: no such archive member
+            return None
+        self.hashed += 1
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (source, mtime_ns, size, digest))
+        return digest
+
+    def get(self, digest: str, parser_version: Any, target_url: str, full_decode: bool) -> Optional[Dict[str, Any]]:
+        row = self._db.execute(
+            "SELECT record FROM records WHERE digest = ? AND parser_version = ? AND target_url = ? AND full_decode = ?",
+            (digest, str(parser_version), target_url, int(full_decode))).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, digest: str, parser_version: Any, target_url: str, full_decode: bool, record: Dict[str, Any]) -> None:
+        """Store a successfully parsed record (records with an 'error' are not cached)."""
+        self.put_encoded(digest, parser_version, target_url, full_decode, encode_record(record))
+
+    def put_encoded(self, digest: str, parser_version: Any, target_url: str, full_decode: bool,
+                    blob: Optional[bytes]) -> None:
+        """Store an encode_record() payload; None is skipped."""
+        if blob is None:
+            return
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?, ?, ?)",
+                             (digest, str(parser_version), target_url, int(full_decode), blob, time.time()))
+
+    def close(self) -> None:
+        self._db.close()
+
+    def summary(self) -> str:
+        return f"Parse cache: {self.hits} hits, {self.misses} misses, {self.hashed} files hashed ({self.path})"
@@ -0,0 +1,36 @@
+from typing import Dict, Iterable, Iterator, List
+
+
+class UrlCollector:
+    """
+    Order-preserving URL set. Membership checks are hash lookups, so
+    deduplicating n URLs is O(n) instead of scanning lists.
+    """
+
+    def __init__(self, urls: Iterable[str] = ()):
+        # dicts keep insertion order; values are unused
+        self._urls: Dict[str, None] = {}
+        self.extend(urls)
+
+    def add(self, url: str) -> bool:
+        """Add `url`; returns False if it was already collected."""
+        if url in self._urls:
+            return False
+        self._urls[url] = None
+        return True
+
+    def extend(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self._urls[url] = None
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._urls
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._urls)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def to_list(self) -> List[str]:
+        return list(self._urls)
@@ -1,57 +1,211 @@
 import csv
-import urllib.parse
+import os
 import contextlib
 
+from .path_trie import PathTrie, path_segments
+from .url_normalization import canonical_parts, canonical_url, normalized_url, registrable_url
+
+KNOWN_ENGINES = ("bing", "google")
+# strongest first: AMP/mobile twins of a page beat a mere parent-path match
+MATCH_TIERS = ("exact", "normalized", "canonical", "path-prefix")
+# opt-in (main.py --registrable-match): same page path on another subdomain of the site
+REGISTRABLE_TIER = "registrable"
+MIN_PREFIX_SEGMENTS = 1     # a bare homepage in the SERP does not path-prefix match everything
+
 # —— Helpers —— #
 
-def normalize_url(url):
-    """
-    Strip scheme, www, query, fragment, trailing slash, lowercase.
-    Returns (domain_core, path).
-    """
-    p = urllib.parse.urlparse(url.strip())
-    # hostname without www
-    host = (p.hostname or "").lower()
-    if host.startswith("www."):
-        host = host[4:]
-    # remove port if present (unlikely in SERP)
-    host = host.split(':')[0]
-
-    # heuristic for domain core:
-    parts = host.split('.')
-    # common 2‑part suffix indicators
-    suffix_inds = {"co","com","net","org","gov","ac","edu"}
-    if len(parts) >= 3 and parts[-1].isalpha() and len(parts[-1])<=3 and parts[-2] in suffix_inds:
-        core = parts[-3]
-    elif len(parts) >= 2:
-        core = parts[-2]
-    else:
-        core = parts[0]
-
-    # path without trailing slash
-    path = p.path.rstrip('/')
-    return core, path
-
-def load_csv_index(csv_path):
+def engine_from_path(csv_path):
+    """Engine name embedded in main.py's CSV file names (<har>_<idx>_<engine>_<query>.csv)."""
+    parts = os.path.basename(csv_path).split('_')
+    for engine in KNOWN_ENGINES:
+        if engine in parts:
+            return engine
+    return None
+
+class SerpIndex:
     """
-    Returns:
-      - exact_map: {url -> row_index}
-      - norm_map:  {(domain_core, path) -> [(url, row_index), ...]}
+    One in-memory index over many SERP CSVs, built once and queried in bulk:
+      url -> [(csv_path, engine, rank), ...]   (first occurrence per CSV, CSVs in load order)
+    The fuzzy tiers use derived indexes, each built from the URLs already
+    indexed when a lookup first needs it and kept current by later add_csv calls:
+      normalized:  normalized_url -> {csv_path: hit}
+      canonical:   canonical_url  -> {csv_path: hit}
+      registrable: registrable_url -> {csv_path: hit}
+      paths:       canonical host -> PathTrie of path segments
     """
-    exact_map = {}
-    norm_map  = {}
-    with open(csv_path, newline='', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for idx, row in enumerate(reader, start=1):
-            url = row.get('URL','').strip()
-            if not url:
+
+    def __init__(self):
+        self.exact = {}
+        self.entries = {}   # csv_path -> number of distinct URLs
+        self.normalized = None
+        self.canonical = None
+        self.registrable = None
+        self.paths = None
+        self._position = {}  # csv_path -> load order
+
+    @classmethod
+    def from_csvs(cls, csv_paths):
+        index = cls()
+        for path in csv_paths:
+            index.add_csv(path)
+        return index
+
+    def add_csv(self, csv_path, engine=None):
+        if csv_path in self.entries:
+            return
+        first = {}
+        with open(csv_path, newline='', encoding='utf-8') as f:
+            # plain csv.reader: DictReader's per-row dict cost more than the whole index build
+            reader = csv.reader(f)
+            header = next(reader, [])
+            if 'URL' in header:
+                column = header.index('URL')
+                keep = first.setdefault
+                for rank, row in enumerate(reader, start=1):
+                    if len(row) > column:
+                        url = row[column].strip()
+                        if url:
+                            keep(url, rank)
+        self._add_first(csv_path, first, engine)
+
+    def add_rows(self, source, rows, engine=None):
+        """Index (rank, url) rows under `source`: a CSV path, or any label for rows read elsewhere."""
+        if source in self.entries:
+            return
+        first = {}
+        for rank, url in rows:
+            url = (url or '').strip()
+            if url and url not in first:
+                first[url] = rank
+        self._add_first(source, first, engine)
+
+    def _add_first(self, source, first, engine):
+        """Index {url: rank of its first row} of one source."""
+        engine = engine or engine_from_path(source)
+        self._position[source] = len(self._position)
+        derived = self._built()
+        exact = self.exact
+        for url, rank in first.items():
+            hit = (source, engine, rank)
+            hits = exact.get(url)
+            if hits is None:
+                exact[url] = [hit]
+            else:
+                hits.append(hit)
+            if derived:
+                self._index_derived(url, hit, derived)
+        self.entries[source] = len(first)
+
+    def add_store(self, store, sources):
+        """
+        Index results-store rows. `sources` maps (har, query, engine) to the
+        label the rows are reported under (e.g. the CSV path they would have had).
+        Returns the labels that had rows.
+        """
+        labels = []
+        for (har, query, engine), label in sources.items():
+            rows = store.results(har, query, engine)
+            if rows:
+                self.add_rows(label, ((row.rank, row.url) for row in rows), engine)
+                labels.append(label)
+        return labels
+
+    def _built(self):
+        return [tier for tier, index in (("normalized", self.normalized),
+                                         ("canonical", self.canonical),
+                                         (REGISTRABLE_TIER, self.registrable),
+                                         ("path-prefix", self.paths)) if index is not None]
+
+    def _index_derived(self, url, hit, tiers):
+        for tier in tiers:
+            if tier == "path-prefix":
+                host, path, _query = canonical_parts(url)
+                trie = self.paths.get(host)
+                if trie is None:
+                    trie = self.paths[host] = PathTrie()
+                trie.add(path_segments(path), hit)
                 continue
-            if url not in exact_map:
-                exact_map[url] = idx
-            # build normalized map
-            core, path = normalize_url(url)
-            norm_map.setdefault((core,path), []).append((url, idx))
-    return exact_map, norm_map
+            if tier == "normalized":
+                bucket = self.normalized.setdefault(normalized_url(url), {})
+            elif tier == "canonical":
+                bucket = self.canonical.setdefault(canonical_url(url), {})
+            else:
+                bucket = self.registrable.setdefault(registrable_url(url), {})
+            # several URLs of one CSV can share a key: keep the best rank
+            best = bucket.get(hit[0])
+            if best is None or hit[2] < best[2]:
+                bucket[hit[0]] = hit
+
+    def build(self, tiers):
+        """Build the derived indexes `tiers` need from the URLs already indexed (no CSV re-read)."""
+        missing = [tier for tier in tiers if tier != "exact" and tier not in self._built()]
+        if not missing:
+            return
+        for tier in missing:
+            if tier == "normalized":
+                self.normalized = {}
+            elif tier == "canonical":
+                self.canonical = {}
+            elif tier == REGISTRABLE_TIER:
+                self.registrable = {}
+            elif tier == "path-prefix":
+                self.paths = {}
+            else:
+                raise ValueError(f"Unknown match tier '{tier}' (expected one of {MATCH_TIERS + (REGISTRABLE_TIER,)})")
+        for url, hits in self.exact.items():
+            for hit in hits:
+                self._index_derived(url, hit, missing)
+
+    def lookup(self, url, csv_paths=None, tier="exact"):
+        """Hits for `url` under one match tier, optionally restricted to a set of CSV paths."""
+        if tier == "exact":
+            hits = self.exact.get(url, ())
+            if csv_paths is None:
+                return list(hits)
+            return [hit for hit in hits if hit[0] in csv_paths]
+
+        self.build((tier,))
+        if tier == "path-prefix":
+            host, path, _query = canonical_parts(url)
+            trie = self.paths.get(host)
+            if trie is None:
+                return []
+            accept = csv_paths.__contains__ if csv_paths is not None else None
+            hits = trie.longest_prefix(path_segments(path), MIN_PREFIX_SEGMENTS, accept)
+        else:
+            if tier == "normalized":
+                bucket = self.normalized.get(normalized_url(url))
+            elif tier == "canonical":
+                bucket = self.canonical.get(canonical_url(url))
+            else:
+                bucket = self.registrable.get(registrable_url(url))
+            if not bucket:
+                return []
+            hits = [hit for path, hit in bucket.items() if csv_paths is None or path in csv_paths]
+        hits.sort(key=lambda hit: self._position[hit[0]])
+        return hits
+
+    def match(self, urls, csv_paths=None, tiers=("exact",)):
+        """
+        Bulk lookup. Each URL is reported under the first tier (in `tiers`
+        order) that finds it.
+        Returns (found: {url -> [(csv_path, row, method), ...]}, not_found: [url, ...])
+        """
+        self.build(tiers)
+        allowed = set(csv_paths) if csv_paths is not None else None
+        if allowed is not None and allowed.issuperset(self.entries):
+            allowed = None      # nothing to filter out (e.g. one index per HAR)
+        found = {}
+        not_found = []
+        for url in urls:
+            for tier in tiers:
+                hits = self.lookup(url, allowed, tier)
+                if hits:
+                    found[url] = [(path, rank, tier) for path, _engine, rank in hits]
+                    break
+            else:
+                not_found.append(url)
+        return found, not_found
 
 def load_text_urls(txt_path):
     with open(txt_path, encoding='utf-8') as f:
@@ -59,47 +213,32 @@ def load_text_urls(txt_path):
 
 # —— Main check —— #
 
-def check_urls(csv_paths=None, txt_path='urls.txt', results_pathfile='results.txt'):
+def check_urls(csv_paths=None, txt_path='urls.txt', results_pathfile='results.txt', index=None,
+               normalized=False, tiers=None):
+    """
+    Check every URL in `txt_path` against the SERP CSVs and write a report.
+    Pass a prebuilt SerpIndex (covering at least `csv_paths`) to avoid re-reading the CSVs.
+    With `normalized`, URLs without an exact hit are retried by normalized_url
+    (tracking parameters, scheme, www, trailing slash ignored). `tiers` picks
+    the match tiers explicitly, e.g. MATCH_TIERS for full fuzzy matching.
+    """
     if csv_paths is None:
         csv_paths = ['bing_results.csv', 'serper_results.csv']
-
-    # load maps for each CSV
-    csv_data = {}
-    for path in csv_paths:
-        exact_map, norm_map = load_csv_index(path)
-        csv_data[path] = {
-            "exact": exact_map,
-            "norm": norm_map
-        }
+    if index is None:
+        index = SerpIndex.from_csvs(csv_paths)
 
     text_urls = load_text_urls(txt_path)
-    found = {}      # url -> list of (path, row, method)
-    not_found = []
-
-    for url in text_urls:
-        matched = []
-        # 1) exact
-        for path, maps in csv_data.items():
-            if url in maps["exact"]:
-                matched.append((path, maps["exact"][url], "exact"))
-        # 2) normalized
-        # if not matched:
-        #     core, pathp = normalize_url(url)
-        #     for path, maps in csv_data.items():
-        #         hits = maps["norm"].get((core, pathp), [])
-        #         for hit_url, row in hits:
-        #             matched.append((path, row, "normalized"))
-        if matched:
-            found[url] = matched
-        else:
-            not_found.append(url)
+    # url -> list of (path, row, method)
+    if tiers is None:
+        tiers = ("exact", "normalized") if normalized else ("exact",)
+    found, not_found = index.match(text_urls, csv_paths, tiers)
 
     # —— Reporting —— #
     with open(results_pathfile, "w", encoding="utf-8") as f, contextlib.redirect_stdout(f):
         # — your existing code starts here —
         print(f"Checked {len(text_urls)} URLs against:")
         for path in csv_paths:
-            total = len(csv_data[path]["exact"])
+            total = index.entries.get(path, 0)
             print(f"  - {path}: {total} entries")
         print()
 
@@ -108,7 +247,7 @@ def check_urls(csv_paths=None, txt_path='urls.txt', results_pathfile='results.tx
             for url, hits in found.items():
                 print(f"  {url}")
                 for path, row, method in hits:
-                    tag = "↳" if method=="normalized" else "→"
+                    tag = "→" if method=="exact" else "↳"
                     print(f"    {tag} {path} (row {row}) [{method}]")
         else:
             print("✅ Found: (none)")
@@ -0,0 +1,60 @@
+"""
+Per-host trie of URL path segments, for path-prefix matching.
+
+Each node holds the SERP hits whose path ends there, keyed by CSV path.
+Finding, per CSV, the SERP URL whose path is the longest ancestor of a
+cited URL's path costs one dict probe per path segment, however many
+SERP rows the host has.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+
+Hit = Tuple[str, Optional[str], int]     # (csv_path, engine, rank)
+
+
+class _Node:
+    __slots__ = ("children", "hits")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.hits: Dict[str, Hit] = {}
+
+
+def path_segments(path: str) -> List[str]:
+    return [segment for segment in path.split("/") if segment]
+
+
+class PathTrie:
+    def __init__(self):
+        self.root = _Node()
+
+    def add(self, segments: List[str], hit: Hit) -> None:
+        node = self.root
+        for segment in segments:
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = _Node()
+            node = child
+        # keep the best-ranked row per CSV at this path
+        best = node.hits.get(hit[0])
+        if best is None or hit[2] < best[2]:
+            node.hits[hit[0]] = hit
+
+    def longest_prefix(self,
+                       segments: List[str],
+                       min_depth: int = 1,
+                       accept: Optional[Callable[[str], bool]] = None) -> List[Hit]:
+        """
+        For each accepted CSV, its hit at the deepest node on `segments`'
+        path (at least `min_depth` segments down).
+        """
+        node = self.root
+        deepest: Dict[str, Hit] = {}
+        for depth, segment in enumerate(segments, start=1):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if depth >= min_depth:
+                for path, hit in node.hits.items():
+                    if accept is None or accept(path):
+                        deepest[path] = hit
+        return list(deepest.values())
@@ -0,0 +1,488 @@
+"""
+Offline public-suffix lookup for registrable-domain extraction.
+
+Rules use the Public Suffix List format (https://publicsuffix.org/list/):
+one suffix per line, `*.` wildcards, `!` exceptions, `//` comments. A
+compact subset is embedded below (generic TLDs, the multi-label ccTLD
+suffixes that show up in SERPs and the captures, and common hosting
+platforms); use_list_file() swaps in the full list (main.py
+--public-suffix-list) when exactness matters. Do that before the first
+lookup: url_normalization memoizes what it derives from these rules.
+"""
+from typing import Dict, Iterable, List, Optional
+
+_EMBEDDED_RULES = """
+// —— generic —— //
+com
+net
+org
+edu
+gov
+mil
+int
+info
+biz
+io
+co
+ai
+app
+dev
+me
+tv
+cc
+ws
+xyz
+online
+site
+tech
+store
+blog
+news
+shop
+cloud
+page
+eu
+asia
+
+// —— country codes with registrations under second-level labels —— //
+uk
+co.uk
+org.uk
+me.uk
+ltd.uk
+plc.uk
+net.uk
+ac.uk
+gov.uk
+nhs.uk
+police.uk
+sch.uk
+au
+com.au
+net.au
+org.au
+edu.au
+gov.au
+asn.au
+id.au
+nz
+co.nz
+org.nz
+net.nz
+ac.nz
+govt.nz
+geek.nz
+school.nz
+jp
+co.jp
+ne.jp
+or.jp
+ac.jp
+go.jp
+ed.jp
+gr.jp
+lg.jp
+*.kawasaki.jp
+*.kitakyushu.jp
+*.kobe.jp
+*.nagoya.jp
+*.sapporo.jp
+*.sendai.jp
+*.yokohama.jp
+!city.kawasaki.jp
+!city.kitakyushu.jp
+!city.kobe.jp
+!city.nagoya.jp
+!city.sapporo.jp
+!city.sendai.jp
+!city.yokohama.jp
+kr
+co.kr
+or.kr
+ne.kr
+ac.kr
+go.kr
+re.kr
+cn
+com.cn
+net.cn
+org.cn
+gov.cn
+edu.cn
+ac.cn
+hk
+com.hk
+org.hk
+net.hk
+edu.hk
+gov.hk
+tw
+com.tw
+org.tw
+net.tw
+edu.tw
+gov.tw
+idv.tw
+sg
+com.sg
+net.sg
+org.sg
+edu.sg
+gov.sg
+my
+com.my
+net.my
+org.my
+edu.my
+gov.my
+th
+co.th
+in.th
+ac.th
+go.th
+or.th
+id
+co.id
+or.id
+ac.id
+go.id
+web.id
+ph
+com.ph
+net.ph
+org.ph
+edu.ph
+gov.ph
+vn
+com.vn
+net.vn
+org.vn
+edu.vn
+gov.vn
+in
+co.in
+net.in
+org.in
+firm.in
+gen.in
+ind.in
+ac.in
+edu.in
+gov.in
+res.in
+pk
+com.pk
+net.pk
+org.pk
+edu.pk
+gov.pk
+gob.pk
+gok.pk
+gon.pk
+gop.pk
+gos.pk
+fam.pk
+biz.pk
+web.pk
+info.pk
+bd
+*.bd
+np
+*.np
+il
+co.il
+org.il
+net.il
+ac.il
+gov.il
+muni.il
+tr
+com.tr
+net.tr
+org.tr
+edu.tr
+gov.tr
+gen.tr
+av.tr
+bel.tr
+sa
+com.sa
+net.sa
+org.sa
+edu.sa
+gov.sa
+ae
+co.ae
+net.ae
+org.ae
+ac.ae
+gov.ae
+eg
+com.eg
+net.eg
+org.eg
+edu.eg
+gov.eg
+za
+co.za
+org.za
+net.za
+ac.za
+gov.za
+web.za
+ng
+com.ng
+net.ng
+org.ng
+edu.ng
+gov.ng
+ke
+co.ke
+or.ke
+ne.ke
+ac.ke
+go.ke
+br
+com.br
+net.br
+org.br
+edu.br
+gov.br
+art.br
+blog.br
+app.br
+mx
+com.mx
+net.mx
+org.mx
+edu.mx
+gob.mx
+ar
+com.ar
+net.ar
+org.ar
+edu.ar
+gob.ar
+int.ar
+cl
+co.cl
+gob.cl
+co
+com.co
+net.co
+org.co
+edu.co
+gov.co
+pe
+com.pe
+net.pe
+org.pe
+edu.pe
+gob.pe
+ve
+com.ve
+net.ve
+org.ve
+ru
+com.ru
+net.ru
+org.ru
+msk.ru
+spb.ru
+ua
+com.ua
+net.ua
+org.ua
+edu.ua
+gov.ua
+kiev.ua
+pl
+com.pl
+net.pl
+org.pl
+edu.pl
+gov.pl
+waw.pl
+es
+com.es
+nom.es
+org.es
+gob.es
+edu.es
+fr
+gouv.fr
+asso.fr
+com.fr
+it
+gov.it
+edu.it
+de
+nl
+be
+ch
+at
+co.at
+or.at
+gv.at
+ac.at
+se
+no
+dk
+fi
+ie
+gov.ie
+pt
+com.pt
+gov.pt
+gr
+com.gr
+gov.gr
+cz
+sk
+hu
+co.hu
+ro
+com.ro
+bg
+ca
+qc.ca
+on.ca
+bc.ca
+ab.ca
+us
+ck
+*.ck
+!www.ck
+er
+*.er
+fk
+*.fk
+kh
+*.kh
+mm
+*.mm
+
+// —— hosting platforms (private section of the list) —— //
+blogspot.com
+github.io
+gitlab.io
+herokuapp.com
+appspot.com
+web.app
+firebaseapp.com
+netlify.app
+vercel.app
+pages.dev
+workers.dev
+azurewebsites.net
+cloudapp.net
+cloudfront.net
+elasticbeanstalk.com
+s3.amazonaws.com
+wordpress.com
+wixsite.com
+squarespace.com
+substack.com
+medium.com
+tumblr.com
+weebly.com
+readthedocs.io
+"""
+
+_END = "$"          # a rule ends at this node
+_EXCEPTION = "!"    # an exception rule ends at this node
+_WILDCARD = "*"
+
+Node = Dict[str, dict]
+
+
+class PublicSuffixTrie:
+    """
+    Trie over reversed domain labels. `suffix_length` implements the PSL
+    algorithm: the longest matching rule wins, exceptions beat wildcards,
+    and an unlisted TLD counts as a one-label suffix.
+    """
+
+    def __init__(self, rules: Iterable[str] = ()):
+        self._root: Node = {}
+        for rule in rules:
+            self.add(rule)
+
+    @classmethod
+    def from_text(cls, text: str) -> "PublicSuffixTrie":
+        trie = cls()
+        for line in text.splitlines():
+            rule = line.strip().split(None, 1)[0] if line.strip() else ""
+            if rule and not rule.startswith("//"):
+                trie.add(rule)
+        return trie
+
+    @classmethod
+    def from_file(cls, path: str) -> "PublicSuffixTrie":
+        """Load a public_suffix_list.dat downloaded from publicsuffix.org."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_text(f.read())
+
+    def add(self, rule: str) -> None:
+        rule = rule.strip().lower()
+        exception = rule.startswith(_EXCEPTION)
+        if exception:
+            rule = rule[1:]
+        node = self._root
+        for label in reversed(rule.split(".")):
+            node = node.setdefault(label, {})
+        node[_EXCEPTION if exception else _END] = {}
+
+    def suffix_length(self, labels: List[str]) -> int:
+        """Number of trailing labels of `labels` (left-to-right host labels) that form the public suffix."""
+        best = 1
+        node = self._root
+        depth = 0
+        for label in reversed(labels):
+            depth += 1
+            child = node.get(label)
+            wildcard = node.get(_WILDCARD)
+            if wildcard is not None and _END in wildcard:
+                if child is not None and _EXCEPTION in child:
+                    return depth - 1
+                best = depth
+            if child is None:
+                break
+            if _EXCEPTION in child:
+                return depth - 1
+            if _END in child:
+                best = depth
+            node = child
+        return best
+
+    def public_suffix(self, host: str) -> str:
+        labels = host.split(".")
+        return ".".join(labels[-self.suffix_length(labels):])
+
+    def registrable_domain(self, host: str) -> Optional[str]:
+        """
+        The public suffix plus one label (eTLD+1), e.g. 'bbc.co.uk' for
+        'news.bbc.co.uk'. None when the host is itself a public suffix.
+        """
+        labels = host.split(".")
+        n = self.suffix_length(labels)
+        if len(labels) <= n:
+            return None
+        return ".".join(labels[-(n + 1):])
+
+
+_default_trie: Optional[PublicSuffixTrie] = None
+
+
+def default_trie() -> PublicSuffixTrie:
+    """Trie of the embedded rules (or the list set by use_list_file), built on first use."""
+    global _default_trie
+    if _default_trie is None:
+        _default_trie = PublicSuffixTrie.from_text(_EMBEDDED_RULES)
+    return _default_trie
+
+
+def use_list_file(path: str) -> None:
+    """Replace the embedded rules with a full public_suffix_list.dat for this process."""
+    global _default_trie
+    _default_trie = PublicSuffixTrie.from_file(path)
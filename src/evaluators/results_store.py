@@ -0,0 +1,133 @@
+"""
+Single SQLite store for the SERP results of a run.
+
+One row per SERP result, (run_id, har, query, engine, rank, title, url,
+normalized_url, fetched_at), indexed on url and normalized_url, replaces
+the thousands of one-query CSVs a large run produces. export_csv() writes
+any (har, query, engine) back out in the scrapers' CSV format.
+"""
+import csv
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from .url_normalization import normalized_url
+
+DEFAULT_RESULTS_FILE = "results.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    run_id         TEXT NOT NULL,
+    har            TEXT NOT NULL,
+    query          TEXT NOT NULL,
+    engine         TEXT NOT NULL,
+    rank           INTEGER NOT NULL,
+    title          TEXT NOT NULL,
+    url            TEXT NOT NULL,
+    normalized_url TEXT NOT NULL,
+    fetched_at     REAL NOT NULL,
+    PRIMARY KEY (run_id, har, query, engine, rank)
+);
+CREATE INDEX IF NOT EXISTS results_url ON results (url);
+CREATE INDEX IF NOT EXISTS results_normalized_url ON results (normalized_url);
+"""
+
+_COLUMNS = "run_id, har, query, engine, rank, title, url, normalized_url, fetched_at"
+
+
+class ResultRow(NamedTuple):
+    run_id: str
+    har: str
+    query: str
+    engine: str
+    rank: int
+    title: str
+    url: str
+    normalized_url: str
+    fetched_at: float
+
+
+class ResultsStore:
+    """
+    Results of one run (`run_id`, a timestamp by default) in a SQLite file.
+    Several runs can share a file; queries default to this store's run.
+    """
+
+    def __init__(self, path: str = DEFAULT_RESULTS_FILE, run_id: Optional[str] = None):
+        self.path = path
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # written from the SERP event loop, read from the evaluation thread
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def add_results(self,
+                    har: str,
+                    query: str,
+                    engine: str,
+                    rows: Iterable[Tuple[str, str]],
+                    fetched_at: Optional[float] = None) -> int:
+        """Store the (title, url) rows of one (har, query, engine), replacing earlier ones. Returns rows stored."""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        records = [(self.run_id, har, query, engine, rank, title, url, normalized_url(url), fetched_at)
+                   for rank, (title, url) in enumerate(rows, start=1)]
+        with self._lock, self._db:
+            self._db.execute(
+                "DELETE FROM results WHERE run_id = ? AND har = ? AND query = ? AND engine = ?",
+                (self.run_id, har, query, engine))
+            self._db.executemany(f"INSERT INTO results ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+        return len(records)
+
+    def _select(self, where: str, params: tuple) -> List[ResultRow]:
+        sql = f"SELECT {_COLUMNS} FROM results WHERE {where} ORDER BY har, query, engine, rank"
+        with self._lock:
+            return [ResultRow(*row) for row in self._db.execute(sql, params)]
+
+    def results(self,
+                har: Optional[str] = None,
+                query: Optional[str] = None,
+                engine: Optional[str] = None,
+                run_id: Optional[str] = None) -> List[ResultRow]:
+        clauses = ["run_id = ?"]
+        params = [run_id or self.run_id]
+        for column, value in (("har", har), ("query", query), ("engine", engine)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return self._select(" AND ".join(clauses), tuple(params))
+
+    def find(self, url: str, normalized: bool = False, run_id: Optional[str] = None) -> List[ResultRow]:
+        """Rows whose url (or, with `normalized`, normalized_url) equals that of `url`."""
+        if normalized:
+            return self._select("run_id = ? AND normalized_url = ?", (run_id or self.run_id, normalized_url(url)))
+        return self._select("run_id = ? AND url = ?", (run_id or self.run_id, url))
+
+    def export_csv(self, har: str, query: str, engine: str, output_file: str, run_id: Optional[str] = None) -> int:
+        """
+        Write one (har, query, engine) as the scrapers' CSV (header plus rows,
+        no file when there are no rows). Returns rows written.
+        """
+        rows = self.results(har, query, engine, run_id)
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        if not rows:
+            return 0
+        with open(output_file, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Page Title", "URL"])
+            writer.writerows((row.title, row.url) for row in rows)
+        return len(rows)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def summary(self) -> str:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM results WHERE run_id = ?", (self.run_id,)).fetchone()[0]
+        return f"Results store: {count} SERP rows for run {self.run_id} ({self.path})"
@@ -0,0 +1,142 @@
+"""
+URL normalization for matching LLM citations against SERP rows.
+
+The normalizers are memoized: the same URLs recur across HARs, CSVs and
+engines, so each distinct URL is parsed once per process.
+
+  normalized_url(url) -> 'dell.com/support/home?lang=en-us'
+      scheme, 'www.', default port, fragment, trailing slash and tracking
+      parameters dropped; remaining query parameters sorted.
+  canonical_url(url)  -> 'dell.com/support/home?lang=en-us'
+      normalized_url that also folds AMP and mobile variants of a page
+      (m./amp. hosts, /amp paths, ?amp=1, Google AMP cache URLs) into the
+      desktop URL.
+  registrable_url(url) -> 'bbc.co.uk/news/uk-123'   (for https://news.bbc.co.uk/news/uk-123)
+      canonical_url with the host cut to its registrable domain (public
+      suffix plus one label, see public_suffix), so the same path on
+      another subdomain of the site matches.
+"""
+import urllib.parse
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from .public_suffix import default_trie
+
+# —— Configuration —— #
+CACHE_SIZE = 1 << 18    # distinct URLs remembered per normalizer
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_")
+TRACKING_PARAMS = frozenset({
+    "gclid", "gclsrc", "dclid", "gbraid", "wbraid", "fbclid", "msclkid", "yclid",
+    "twclid", "ttclid", "li_fat_id", "igshid", "mc_cid", "mc_eid", "_ga", "_gl",
+    "_hsenc", "_hsmi", "mkt_tok", "oly_anon_id", "oly_enc_id", "vero_id",
+    "rb_clickid", "s_cid", "srsltid", "ref_src", "ref_url",
+})
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+MOBILE_HOST_PREFIXES = ("m.", "mobile.", "amp.")
+AMP_CACHE_SUFFIX = ".cdn.ampproject.org"
+AMP_PARAMS = frozenset({"amp", "amp=1", "amp=true", "outputtype=amp", "output=amp"})
+# ———————— #
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def strip_tracking(query: str) -> str:
+    """Drop tracking parameters from a raw query string and sort the rest."""
+    if not query:
+        return ""
+    kept = [pair for pair in query.split("&")
+            if pair and not is_tracking_param(pair.split("=", 1)[0])]
+    kept.sort()
+    return "&".join(kept)
+
+
+def _host(netloc: str, scheme: str) -> str:
+    host = netloc.rpartition("@")[2].lower()
+    if host.startswith("["):                       # IPv6 literal
+        return host
+    name, _, port = host.partition(":")
+    if port and port != DEFAULT_PORTS.get(scheme):
+        name = f"{name}:{port}"
+    if name.startswith("www."):
+        name = name[4:]
+    return name.rstrip(".")
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalized_url(url: str) -> str:
+    """Canonical comparison form of `url` (see module docstring)."""
+    scheme, netloc, path, query, _fragment = urllib.parse.urlsplit(url.strip())
+    key = _host(netloc, scheme.lower()) + path.rstrip("/")
+    query = strip_tracking(query)
+    return f"{key}?{query}" if query else key
+
+
+def _amp_cache_target(path: str) -> Optional[str]:
+    """Origin URL of a Google AMP cache path (/c/s/example.com/page -> https://example.com/page)."""
+    parts = path.split("/", 4)     # ['', 'c', 's', host, rest]
+    if len(parts) < 4 or parts[1] not in ("c", "v", "i"):
+        return None
+    if parts[2] == "s":
+        return "https://" + "/".join(parts[3:])
+    return "http://" + "/".join(parts[2:])
+
+
+def _canonical_path(path: str) -> str:
+    path = path.rstrip("/")
+    if path.endswith("/amp"):
+        path = path[:-4]
+    elif path.startswith("/amp/"):
+        path = path[4:]
+    elif path.endswith(".amp"):
+        path = path[:-4]
+    elif path.endswith(".amp.html"):
+        path = path[:-9] + ".html"
+    return path
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical_parts(url: str) -> Tuple[str, str, str]:
+    """(host, path, query) of canonical_url(url)."""
+    scheme, netloc, path, query, _fragment = urllib.parse.urlsplit(url.strip())
+    host = _host(netloc, scheme.lower())
+    if host.endswith(AMP_CACHE_SUFFIX):
+        target = _amp_cache_target(path)
+        if target:
+            return canonical_parts(target)
+    for prefix in MOBILE_HOST_PREFIXES:
+        if host.startswith(prefix) and "." in host[len(prefix):]:
+            host = host[len(prefix):]
+            break
+    query = "&".join(pair for pair in strip_tracking(query).split("&")
+                     if pair.lower() not in AMP_PARAMS)
+    return host, _canonical_path(path), query
+
+
+def canonical_url(url: str) -> str:
+    host, path, query = canonical_parts(url)
+    return f"{host}{path}?{query}" if query else host + path
+
+
+def registrable_domain(host: str) -> Optional[str]:
+    """eTLD+1 of a bare host name ('news.bbc.co.uk' -> 'bbc.co.uk'); None for IP literals and bare suffixes."""
+    host = host.lower().rstrip(".")
+    if not host or host.startswith("[") or host[-1:].isdigit():
+        return None
+    return default_trie().registrable_domain(host)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def registrable_url(url: str) -> str:
+    """canonical_url keyed on the registrable domain instead of the full host."""
+    host, path, query = canonical_parts(url)
+    name, sep, port = host.partition(":")
+    host = (registrable_domain(name) or name) + sep + port
+    return f"{host}{path}?{query}" if query else host + path
+
+
+def cache_info() -> str:
+    return (f"normalized_url {normalized_url.cache_info()}; canonical_parts {canonical_parts.cache_info()}; "
+            f"registrable_url {registrable_url.cache_info()}")
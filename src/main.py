@@ -3,18 +3,33 @@ import os
 import json
 from datetime import datetime
 
-from serp_scrapers.bing_scraper import scrape_bing_to_csv
-from serp_scrapers.google_scraper import scrape_google_to_csv  # if available
-from evaluators.evaluation import check_urls  # URL evaluation helper
-from chatgpt_scraper.har_parser import har_parser  # For parsing .har files
+from serp_scrapers.async_runner import DEFAULT_LIMITS, ENGINES, EngineLimits, SerpJob, SerpRunner
+from serp_scrapers.http_client import DEFAULT_POOL_SIZE, configure_http
+from serp_scrapers.retry import Retrier, RetryPolicy
+from serp_scrapers.run_manifest import RunManifest, find_manifest, manifest_path
+from serp_scrapers.serp_cache import DEFAULT_CACHE_FILE, DEFAULT_TTL, SerpCache
+from evaluators.evaluation import MATCH_TIERS, REGISTRABLE_TIER, SerpIndex, check_urls  # URL evaluation helper
+from evaluators.public_suffix import use_list_file
+from evaluators.results_store import ResultsStore
+from chatgpt_scraper.har_parser import CONVERSATION_URL, iter_har_parser  # For parsing .har files
+from chatgpt_scraper.har_sources import expand_har_sources, har_keys
+from chatgpt_scraper.parse_cache import DEFAULT_PARSE_CACHE_FILE, ParseCache
+from chatgpt_scraper.url_collector import UrlCollector
+from pipeline import DEFAULT_QUEUE_SIZE, DEFAULT_SERP_WORKERS, run_pipeline
 
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Unified SERP scraper & evaluator using .har inputs"
     )
     parser.add_argument(
-        '--har-files', nargs='+', required=True,
-        help='List of .har files to parse'
+        '--har-files', nargs='+',
+        help='List of .har files to parse; zip archives are read in place, e.g. data.zip or "data.zip:hars/*.har"'
+    )
+    parser.add_argument(
+        '--resume', default=None, metavar='RUN',
+        help='Resume an interrupted run: its output directory (latest run in it) or its run_*.manifest.sqlite3 file. '
+             'HARs, engines, -m, -i, -o, result-store and HAR parsing (--target-url, --all-turns, --full-decode, '
+             '--slim) settings come from that run'
     )
     parser.add_argument(
         '-s', '--search-engines', nargs='+', default=['bing', 'google'],
@@ -33,11 +48,184 @@ def parse_args():
         '-o', '--output-dir', default='outputs',
         help='Directory to save query folders and results'
     )
+    parser.add_argument(
+        '--concurrency', type=int, default=None,
+        help='Max in-flight SERP requests per search engine (default: per-engine setting)'
+    )
+    parser.add_argument(
+        '--rate-limit', type=float, default=None,
+        help='Max SERP requests per second per search engine, 0 = unlimited (default: per-engine setting)'
+    )
+    parser.add_argument(
+        '--burst', type=int, default=None,
+        help='Requests per search engine allowed back-to-back before --rate-limit applies'
+    )
+    parser.add_argument(
+        '--page-lookahead', type=int, default=None,
+        help='Pages of one query fetched at once; the next starts when an earlier one comes back non-empty '
+             '(default: per-engine setting, 1 = no requests past the last page)'
+    )
+    parser.add_argument(
+        '--rate-state', default=None,
+        help='SQLite file holding rate-limit buckets; processes sharing it share one quota per engine/API key'
+    )
+    parser.add_argument(
+        '--results-db', nargs='?', const='', default=None, metavar='PATH',
+        help='Also store every SERP result of the run in one SQLite file (default: <output-dir>/results_<timestamp>.sqlite3)'
+    )
+    parser.add_argument(
+        '--csv', action=argparse.BooleanOptionalAction, default=True,
+        help='Write one CSV per HAR/query/engine (--no-csv needs --results-db)'
+    )
+    parser.add_argument(
+        '--cache', action=argparse.BooleanOptionalAction, default=True,
+        help='Reuse SERP pages cached by earlier runs (--no-cache to always fetch)'
+    )
+    parser.add_argument(
+        '--refresh', action='store_true',
+        help='Ignore cached SERP pages but store the freshly fetched ones'
+    )
+    parser.add_argument(
+        '--cache-path', default=None,
+        help=f'SERP cache database (default: <output-dir>/{DEFAULT_CACHE_FILE})'
+    )
+    parser.add_argument(
+        '--cache-ttl', type=float, default=DEFAULT_TTL / 3600,
+        help='Hours a cached SERP page stays valid'
+    )
+    parser.add_argument(
+        '--max-retries', type=int, default=RetryPolicy().max_attempts - 1,
+        help='Retries per SERP request on 429/5xx/network errors'
+    )
+    parser.add_argument(
+        '--retry-budget', type=int, default=RetryPolicy().budget,
+        help='Total SERP retries allowed per search engine per run'
+    )
+    parser.add_argument(
+        '--http-pool-size', type=int, default=None,
+        help='Keep-alive connections per host for SERP APIs (default: enough for --concurrency)'
+    )
+    parser.add_argument(
+        '--http-timeout', type=float, default=None,
+        help='Timeout in seconds for every SERP API request (default: each engine\'s own, 10 s for Google, none for Bing)'
+    )
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='Number of processes used to parse HAR files (0 = one per CPU)'
+    )
+    parser.add_argument(
+        '--dedupe-queries', action=argparse.BooleanOptionalAction, default=True,
+        help='Fetch each (engine, query) once per run, even when several HARs issue it, and copy the results to each HAR'
+    )
+    parser.add_argument(
+        '--har-concurrency', type=int, default=DEFAULT_SERP_WORKERS,
+        help='HARs whose SERP jobs are fetched at the same time'
+    )
+    parser.add_argument(
+        '--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+        help='Parsed/fetched HARs buffered between pipeline stages'
+    )
+    parser.add_argument(
+        '--target-url', nargs='+', default=[CONVERSATION_URL], metavar='PATTERN',
+        help='Request URLs of the conversation entries to extract: exact URLs, prefixes ending in "*" or "re:<regex>"'
+    )
+    parser.add_argument(
+        '--all-turns', action='store_true',
+        help='Extract every matching entry of a HAR (all turns / regenerations) instead of only the first'
+    )
+    parser.add_argument(
+        '--slim', action=argparse.BooleanOptionalAction, default=True,
+        help="Drop each conversation's SSE body from the parsed HAR records once queries/URLs are extracted "
+             "(--no-slim keeps it in metrics['content_text'])"
+    )
+    parser.add_argument(
+        '--parse-cache', action=argparse.BooleanOptionalAction, default=True,
+        help='Reuse HARs parsed by earlier runs when neither the file nor the parser changed'
+    )
+    parser.add_argument(
+        '--parse-cache-path', default=None,
+        help=f'Parse cache database (default: <output-dir>/{DEFAULT_PARSE_CACHE_FILE})'
+    )
+    parser.add_argument(
+        '--full-decode', action='store_true',
+        help='Decode every SSE event instead of pre-filtering (debugging)'
+    )
+    parser.add_argument(
+        '--normalized-match', action='store_true',
+        help='Also match LLM URLs to SERP rows by normalized URL (ignores scheme, www, trailing slash, tracking parameters)'
+    )
+    parser.add_argument(
+        '--fuzzy-match', action='store_true',
+        help='Match in tiers: exact, normalized, canonical (AMP/mobile variants), then path-prefix'
+    )
+    parser.add_argument(
+        '--registrable-match', action='store_true',
+        help='Also match LLM URLs to SERP rows with the same page on another subdomain of the site '
+             '(registrable domain from the public-suffix list; reported as [registrable])'
+    )
+    parser.add_argument(
+        '--public-suffix-list', default=None, metavar='PATH',
+        help='Full public_suffix_list.dat for --registrable-match (default: the embedded subset)'
+    )
     parser.add_argument(
         '-l', '--logs-print', default=False,
         help='Directory to save query folders and results'
     )
-    return parser.parse_args()
+    args = parser.parse_args()
+    if not args.har_files and not args.resume:
+        parser.error('--har-files is required unless --resume is given')
+    if not args.csv and args.results_db is None:
+        parser.error('--no-csv needs --results-db')
+    if args.resume:
+        check_resume_settings(parser, args)
+    return args
+
+
+# Settings that decide which queries and URLs are extracted from each HAR
+PARSE_SETTINGS = ('target_url', 'all_turns', 'full_decode', 'slim')
+# Settings a resumed run takes from its manifest rather than the command line
+RESUMED_SETTINGS = ('har_files', 'search_engines', 'max_se_index', 'index_interval',
+                    'output_dir', 'results_db', 'csv') + PARSE_SETTINGS
+
+
+def check_resume_settings(parser, args):
+    """Refuse to resume with parse settings given on the command line that differ from the run's."""
+    manifest = RunManifest(find_manifest(args.resume))
+    run_id, config = manifest.run_id, manifest.config
+    manifest.close()
+    for key in PARSE_SETTINGS:
+        given = getattr(args, key)
+        if key in config and given != parser.get_default(key) and given != config[key]:
+            parser.error(f"--resume: run {run_id} was parsed with {key}={config[key]!r}, "
+                         f"not {given!r}; drop the option or start a new run")
+
+
+def match_tiers(args):
+    """URL match tiers to try, strongest first."""
+    if args.fuzzy_match:
+        tiers = list(MATCH_TIERS)
+    elif args.normalized_match:
+        tiers = ["exact", "normalized"]
+    else:
+        tiers = ["exact"]
+    if args.registrable_match:
+        # a sibling-subdomain twin of the page beats a mere parent-path match
+        at = tiers.index("path-prefix") if "path-prefix" in tiers else len(tiers)
+        tiers.insert(at, REGISTRABLE_TIER)
+    return tuple(tiers)
+
+
+def engine_limits(args):
+    """Per-engine SERP limits with any command-line overrides applied."""
+    limits = {}
+    for engine, base in DEFAULT_LIMITS.items():
+        limits[engine] = EngineLimits(
+            concurrency=args.concurrency or base.concurrency,
+            rate=base.rate if args.rate_limit is None else args.rate_limit,
+            burst=args.burst or base.burst,
+            lookahead=args.page_lookahead or base.lookahead
+        )
+    return limits
 
 
 def main():
@@ -47,69 +235,146 @@ def main():
         if args.logs_print:
             print(toPrint)
 
-    # Ensure output directory
-    os.makedirs(args.output_dir, exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if args.public_suffix_list:
+        use_list_file(args.public_suffix_list)
 
-    # Parse HAR files
-    parsed_entries = har_parser(args.har_files)
-    printLog("All .har files parsed")
-    # return
+    if args.resume:
+        # Pick the run back up under its own timestamp, so its folders and checkpoints are reused
+        manifest = RunManifest(find_manifest(args.resume))
+        timestamp = manifest.run_id
+        for key, value in manifest.config.items():
+            setattr(args, key, value)
+        print(f"Resuming run {timestamp}. {manifest.summary()}")
+    else:
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        os.makedirs(args.output_dir, exist_ok=True)
+        args.har_files = expand_har_sources(args.har_files, absolute=True)
+        manifest = RunManifest.create(
+            manifest_path(args.output_dir, timestamp),
+            run_id=timestamp,
+            config={key: getattr(args, key) for key in RESUMED_SETTINGS}
+        )
 
-    # Iterate over each HAR entry
-    for entry in parsed_entries:
-        harname = os.path.splitext(os.path.basename(entry['harname']))[0]
+    limits = engine_limits(args)
+    configure_http(
+        pool_size=args.http_pool_size or max(DEFAULT_POOL_SIZE, *(l.concurrency for l in limits.values())),
+        timeout=args.http_timeout
+    )
+    cache = None
+    if args.cache:
+        cache = SerpCache(
+            path=args.cache_path or os.path.join(args.output_dir, DEFAULT_CACHE_FILE),
+            ttl=args.cache_ttl * 3600,
+            refresh=args.refresh
+        )
+    retrier = Retrier(RetryPolicy(max_attempts=args.max_retries + 1, budget=args.retry_budget))
+    store = None
+    if args.results_db is not None:
+        store = ResultsStore(
+            path=args.results_db or os.path.join(args.output_dir, f"results_{timestamp}.sqlite3"),
+            run_id=timestamp
+        )
+    engines = [engine for engine in args.search_engines if engine in ENGINES]
+    runner = SerpRunner(limits, cache=cache, retrier=retrier, rate_state=args.rate_state,
+                        store=store, write_csv=args.csv, manifest=manifest, dedupe=args.dedupe_queries)
+    # Unique per HAR source (archives share member names), stable across --resume
+    keys = har_keys(args.har_files)
+
+    def har_folder(entry):
+        harname = keys[entry['harname']]
+        return harname, os.path.join(args.output_dir, f"{harname}_{timestamp}")
+
+    def plan_har(entry):
+        """Create the HAR's folder and return its SERP jobs."""
+        harname, folder = har_folder(entry)
         # Folder per HAR
-        folder = os.path.join(args.output_dir, f"{harname}_{timestamp}")
         os.makedirs(folder, exist_ok=True)
 
-        printLog("Running SERP on "+harname)
-
         # Scrape each search string
+        jobs = []
         for idx, query in enumerate(entry.get('search_strings', []), start=1):
             safe_q = query.replace(' ', '_')[:12]
             for engine in args.search_engines:
-                csv_path = os.path.join(folder, f"{harname}_{idx}_{engine}_{safe_q}.csv")
-                if engine == 'bing':
-                    printLog("Running bing for "+harname)
-                    scrape_bing_to_csv(
-                        query=query,
-                        output_file=csv_path,
-                        max_results=args.max_se_index,
-                        batch_size=args.index_interval
-                    )
-                elif engine == 'google':
-                    printLog("Running Google for "+harname)
-                    scrape_google_to_csv(
-                        query=query,
-                        output_file=csv_path,
-                        max_results=args.max_se_index,
-                        page_size=args.index_interval
-                    )
-                else:
+                if engine not in ENGINES:
                     print(f"Engine '{engine}' not supported. Skipping.")
+                    continue
+                csv_path = os.path.join(folder, f"{harname}_{idx}_{engine}_{safe_q}.csv")
+                jobs.append(SerpJob(
+                    engine=engine,
+                    query=query,
+                    output_file=csv_path,
+                    max_results=args.max_se_index,
+                    page_size=args.index_interval,
+                    har=harname
+                ))
+        printLog(f"Running {len(jobs)} SERP jobs for {harname}")
+        return jobs
+
+    def evaluate_har(entry, jobs, written):
+        """Index the HAR's SERP results and check its LLM URLs against them."""
+        harname, folder = har_folder(entry)
+        # one index per HAR: it is only checked against its own results, so nothing is shared across HARs
+        serp_index = SerpIndex()
+        if args.csv:
+            csv_files = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.csv')]
+            for path in csv_files:
+                serp_index.add_csv(path)
+        else:
+            # no CSVs on disk: rows come from the store, labelled with the CSV path they would have had
+            csv_files = serp_index.add_store(store, {(job.har, job.query, job.engine): job.output_file
+                                                     for job in jobs})
 
         # Prepare URL list file (merge and dedupe)
-        # urls = set(entry.get('url', []) + entry.get('cited_url', []))
-        urls = set(entry.get('url', []))
+        # urls = UrlCollector(entry.get('url', []) + entry.get('cited_url', []))
+        urls = UrlCollector(entry.get('url', []))
         urls_txt = os.path.join(folder, f"urls_to_eval_{timestamp}.txt")
         with open(urls_txt, 'w', encoding='utf-8') as f:
             for u in sorted(urls):
                 f.write(u + '\n')
 
-        # Gather all CSVs
-        csv_files = [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith('.csv')]
         if csv_files:
             results_txt = os.path.join(folder, f"evaluation_results_{timestamp}.txt")
             check_urls(
                 csv_paths=csv_files,
                 txt_path=urls_txt,
-                results_pathfile=results_txt
+                results_pathfile=results_txt,
+                index=serp_index,
+                tiers=match_tiers(args)
             )
             print(f"Finished evaluation for {harname}, see {results_txt}")
         else:
             print(f"No CSVs found for {harname}, skipping evaluation.")
 
+    parse_cache = None
+    if args.parse_cache:
+        parse_cache = ParseCache(args.parse_cache_path or os.path.join(args.output_dir, DEFAULT_PARSE_CACHE_FILE))
+
+    # Parse HAR files -> fetch SERPs -> evaluate, each stage feeding the next through a bounded queue
+    parsed_entries = iter_har_parser(args.har_files, workers=args.jobs, full_decode=args.full_decode,
+                                     cache=parse_cache, target_url=args.target_url, all_turns=args.all_turns,
+                                     slim=args.slim)
+    try:
+        run_pipeline(parsed_entries, plan_har, evaluate_har, runner, engines,
+                     queue_size=args.queue_size, serp_workers=args.har_concurrency)
+    finally:
+        print(retrier.summary())
+        if args.dedupe_queries:
+            print(f"SERP dedupe: {runner.dedupe_stats!r}")
+        if runner.incomplete:
+            print(f"SERP jobs incomplete: {len(runner.incomplete)} stopped at a failed page "
+                  f"(results up to it kept; --resume {args.output_dir} fetches the rest)")
+        if parse_cache is not None:
+            print(parse_cache.summary())
+            parse_cache.close()
+        if cache is not None:
+            print(cache.summary())
+            cache.close()
+        if store is not None:
+            print(store.summary())
+            store.close()
+
+    manifest.mark_finished()
+    manifest.close()
     print("All .har inputs processed.")
 
 
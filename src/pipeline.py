@@ -0,0 +1,106 @@
+"""
+Staged HAR -> SERP -> evaluation pipeline.
+
+Three stages joined by bounded queues, so they overlap instead of running
+one after another:
+  parse:    pulls parsed HARs from an iterator (in a worker thread)
+  fetch:    `serp_workers` tasks plan each HAR's SERP jobs and run them on
+            a shared SerpRunner (its per-engine limits still apply)
+  evaluate: one worker thread evaluates each HAR as soon as its jobs finish
+A full queue makes the stage before it wait, so memory stays bounded and
+total wall time approaches that of the slowest stage.
+"""
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List
+
+from serp_scrapers.async_runner import SerpJob, SerpRunner
+
+# —— Configuration —— #
+DEFAULT_QUEUE_SIZE   = 4     # parsed / fetched HARs waiting for the next stage
+DEFAULT_SERP_WORKERS = 4     # HARs whose SERP jobs run at the same time
+# ———————— #
+
+_DONE = object()
+
+Entry = Dict[str, Any]
+Planner = Callable[[Entry], List[SerpJob]]
+Evaluator = Callable[[Entry, List[SerpJob], List[int]], None]
+
+
+async def _pipeline(entries: Iterable[Entry],
+                    plan: Planner,
+                    evaluate: Evaluator,
+                    runner: SerpRunner,
+                    queue_size: int,
+                    serp_workers: int) -> int:
+    loop = asyncio.get_running_loop()
+    parsed: asyncio.Queue = asyncio.Queue(queue_size)
+    fetched: asyncio.Queue = asyncio.Queue(queue_size)
+    evaluated = 0
+
+    async def parse_stage():
+        it = iter(entries)
+        while True:
+            entry = await loop.run_in_executor(None, next, it, _DONE)
+            if entry is _DONE:
+                break
+            await parsed.put(entry)
+        for _ in range(serp_workers):
+            await parsed.put(_DONE)
+
+    async def fetch_stage():
+        while True:
+            entry = await parsed.get()
+            if entry is _DONE:
+                break
+            jobs = plan(entry)
+            written = await asyncio.gather(*(runner.run_job(job) for job in jobs))
+            await fetched.put((entry, jobs, list(written)))
+        await fetched.put(_DONE)
+
+    async def evaluate_stage():
+        nonlocal evaluated
+        running = serp_workers
+        while running:
+            item = await fetched.get()
+            if item is _DONE:
+                running -= 1
+                continue
+            await loop.run_in_executor(None, evaluate, *item)
+            evaluated += 1
+
+    tasks = [asyncio.ensure_future(parse_stage()),
+             *(asyncio.ensure_future(fetch_stage()) for _ in range(serp_workers)),
+             asyncio.ensure_future(evaluate_stage())]
+    try:
+        # a failing stage would leave the others blocked on their queues
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return evaluated
+
+
+def run_pipeline(entries: Iterable[Entry],
+                 plan: Planner,
+                 evaluate: Evaluator,
+                 runner: SerpRunner,
+                 engines: Iterable[str],
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 serp_workers: int = DEFAULT_SERP_WORKERS) -> int:
+    """
+    Blocking entry point. `plan(entry)` returns a parsed HAR's SerpJobs;
+    `evaluate(entry, jobs, rows_written)` runs once they have all finished.
+    Returns the number of HARs evaluated.
+    """
+    async def main():
+        runner.start(engines)
+        try:
+            return await _pipeline(entries, plan, evaluate, runner, queue_size, max(1, serp_workers))
+        finally:
+            runner.close()
+
+    return asyncio.run(main())
@@ -0,0 +1,288 @@
+"""
+Concurrent SERP execution engine.
+
+Runs the pages of many (engine, query) jobs at once on asyncio, with a
+per-engine cap on in-flight requests and a per-engine request rate. Each
+job keeps only a few pages in flight (EngineLimits.lookahead), starting
+the next one as earlier pages come back non-empty, so few requests are
+spent past a query's last page. The
+blocking fetchers (fetch_bing_results / fetch_serper_page) run in a thread
+pool; pages are then assembled in order with the same stop rules as
+scrape_bing_to_csv / scrape_google_to_csv, so the CSVs are byte-identical.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from . import bing_scraper, google_scraper
+from .bing_scraper import WSA_COUNTRY, bing_pages, fetch_bing_results
+from .google_scraper import fetch_serper_page, serper_pages
+from .rate_limit import TokenBucket, make_bucket
+from .result_sink import CsvSink
+from .retry import Retrier
+from .run_manifest import RunManifest
+from .serp_cache import SerpCache, normalize_query
+
+Row = Tuple[str, str]
+
+
+class EngineSpec(NamedTuple):
+    fetch: Callable[[str, int, int], List[Row]]   # (query, page param, page size) -> rows
+    pages: Callable[[int, int], List[int]]        # (max_results, page size) -> page params
+    capped: bool                                  # stop once max_results rows are collected
+    geo: str = ''                                 # location the engine is queried from (cache key)
+    api_key_env: str = ''                         # env var holding the API key (rate-limit bucket)
+
+
+class EngineLimits(NamedTuple):
+    concurrency: int    # max in-flight requests
+    rate: float         # token-bucket refill, requests per second (0 = unlimited)
+    burst: int = 1      # token-bucket capacity
+    lookahead: int = 2  # pages of one query in flight at once (at most `concurrency`)
+
+
+class SerpJob(NamedTuple):
+    engine: str
+    query: str
+    output_file: str
+    max_results: int
+    page_size: int
+    har: str = ''       # HAR the query came from (results store)
+
+
+ENGINES: Dict[str, EngineSpec] = {
+    'bing': EngineSpec(fetch_bing_results, bing_pages, capped=False, geo=WSA_COUNTRY,
+                       api_key_env='WSA_API_KEY'),
+    'google': EngineSpec(fetch_serper_page, serper_pages, capped=True, api_key_env='API_KEY'),
+}
+
+DEFAULT_LIMITS: Dict[str, EngineLimits] = {
+    'bing': EngineLimits(concurrency=4, rate=bing_scraper.RATE_PER_SEC, burst=bing_scraper.RATE_BURST),
+    'google': EngineLimits(concurrency=8, rate=google_scraper.RATE_PER_SEC, burst=google_scraper.RATE_BURST),
+}
+
+
+def write_serp_csv(output_file: str, batches: List[List[Row]]) -> int:
+    """
+    Write fetched pages the way the scrape_*_to_csv writers do: header plus
+    rows, and no file at all when nothing was fetched. The file is replaced
+    atomically. Returns rows written.
+    """
+    with CsvSink(output_file) as sink:
+        for batch in batches:
+            sink.write_rows(batch)
+    return sink.rows_written
+
+
+class DedupeStats:
+    def __init__(self):
+        self.unique = 0         # (engine, query) fetches made
+        self.reused = 0         # jobs served from another job's fetch
+        self.pages_saved = 0    # page requests those jobs did not make
+
+    def __repr__(self):
+        return f"{self.unique} unique queries fetched, {self.reused} jobs reused them ({self.pages_saved} page fetches saved)"
+
+
+class SerpRunner:
+    """
+    Executes SerpJobs concurrently. One instance per run; limits are per engine.
+    Pages found in `cache` are served from it without touching the limits.
+    Failed requests go through `retrier` (backoff outside the concurrency slot).
+    With `rate_state`, rate limits are token buckets in that SQLite file,
+    shared with every other process using it.
+    Each job's rows also go to `store` (anything with add_results(har, query,
+    engine, rows), e.g. evaluators.results_store.ResultsStore) when given;
+    `write_csv=False` skips the per-job CSVs.
+    With a `manifest`, finished pages and jobs are checkpointed as they
+    complete, and ones already recorded there are not fetched again.
+    With `dedupe`, jobs for the same engine and normalized query (e.g. from
+    different HARs) share one fetch; each still gets its own CSV.
+    """
+
+    def __init__(self,
+                 limits: Optional[Dict[str, EngineLimits]] = None,
+                 cache: Optional[SerpCache] = None,
+                 retrier: Optional[Retrier] = None,
+                 rate_state: Optional[str] = None,
+                 store=None,
+                 write_csv: bool = True,
+                 manifest: Optional[RunManifest] = None,
+                 dedupe: bool = False):
+        self.limits = dict(DEFAULT_LIMITS)
+        self.limits.update(limits or {})
+        self.cache = cache
+        self.retrier = retrier or Retrier()
+        self.rate_state = rate_state
+        self.store = store
+        self.write_csv = write_csv
+        self.manifest = manifest
+        self.dedupe = dedupe
+        self.dedupe_stats = DedupeStats()
+        self.incomplete: List[SerpJob] = []     # jobs cut short by a failed page
+        self._shared: Dict[tuple, asyncio.Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._limiters: Dict[str, TokenBucket] = {}
+
+    async def _fetch(self, job: SerpJob, page: int) -> List[Row]:
+        engine, query, page_size = job.engine, job.query, job.page_size
+        if self.manifest is not None:
+            # a shared fetch may have been checkpointed under another HAR
+            rows = self.manifest.get_page(None if self.dedupe else job.har, query, engine, page, page_size)
+            if rows is not None:
+                return rows
+        rows = await self._fetch_page(engine, query, page, page_size)
+        if self.manifest is not None:
+            self.manifest.page_done(job.har, query, engine, page, page_size, rows)
+        return rows
+
+    async def _fetch_page(self, engine: str, query: str, page: int, page_size: int) -> List[Row]:
+        spec = ENGINES[engine]
+        if self.cache is not None:
+            rows = self.cache.get(engine, query, page, page_size, spec.geo)
+            if rows is not None:
+                return rows
+        async def attempt() -> List[Row]:
+            async with self._semaphores[engine]:
+                await self._limiters[engine].acquire_async()
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, spec.fetch, query, page, page_size)
+
+        rows = await self.retrier.call_async(engine, attempt)
+        # empty pages are not cached: they may be a transient API failure
+        if self.cache is not None and rows:
+            self.cache.put(engine, query, page, page_size, rows, spec.geo)
+        return rows
+
+    async def _collect(self, job: SerpJob) -> Tuple[List[List[Row]], bool, int]:
+        """
+        Fetch one job's pages, up to `lookahead` at a time, and assemble them
+        in order: page N + lookahead starts once page N came back non-empty.
+        A page that fails for good ends the job there, so every row keeps
+        its true rank. Returns (batches, whether a page failed, pages consumed).
+        """
+        spec = ENGINES[job.engine]
+        limits = self.limits[job.engine]
+        window = max(1, min(limits.lookahead, limits.concurrency))
+        pages = spec.pages(job.max_results, job.page_size)
+        tasks: Dict[int, asyncio.Future] = {}
+
+        def start(i: int) -> None:
+            if i < len(pages) and i not in tasks:
+                tasks[i] = asyncio.ensure_future(self._fetch(job, pages[i]))
+
+        for i in range(window):
+            start(i)
+        batches: List[List[Row]] = []
+        total = 0
+        failed = False
+        consumed = 0
+        try:
+            for i, page in enumerate(pages):
+                consumed += 1
+                try:
+                    batch = await tasks[i]
+                except Exception as e:
+                    # later pages would sit at the wrong ranks; keep the complete prefix only
+                    print(f"[{job.engine}] Error on page {page} for '{job.query}': {e}. "
+                          f"Stopping; results end at rank {total}.")
+                    failed = True
+                    break
+                if not batch:
+                    print(f"[{job.engine}] No more results at page {page} for '{job.query}'. Stopping.")
+                    break
+                batches.append(batch)
+                total += len(batch)
+                if spec.capped and total >= job.max_results:
+                    break
+                start(i + window)
+        finally:
+            # pages past the stopping point are not needed
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        return batches, failed, consumed
+
+    async def _collect_once(self, job: SerpJob) -> Tuple[List[List[Row]], bool, int]:
+        """_collect, shared by every job asking the same engine the same (normalized) query."""
+        if not self.dedupe:
+            return await self._collect(job)
+        key = (job.engine, normalize_query(job.query), job.max_results, job.page_size)
+        shared = self._shared.get(key)
+        if shared is None:
+            shared = self._shared[key] = asyncio.ensure_future(self._collect(job))
+            self.dedupe_stats.unique += 1
+            return await asyncio.shield(shared)
+        result = await asyncio.shield(shared)
+        self.dedupe_stats.reused += 1
+        self.dedupe_stats.pages_saved += result[2]
+        return result
+
+    async def run_job(self, job: SerpJob) -> int:
+        """Fetch all pages of one job concurrently and write its CSV / store rows. Returns rows written."""
+        if self.manifest is not None:
+            done = self.manifest.get_job(job.har, job.query, job.engine)
+            if done is not None and (os.path.exists(done[0]) or not done[1] or not self.write_csv):
+                print(f"[{job.engine}] '{job.query}' already done in this run ({done[1]} results). Skipping.")
+                return done[1]
+        batches, failed, _consumed = await self._collect_once(job)
+
+        if self.store is not None:
+            self.store.add_results(job.har, job.query, job.engine, (row for batch in batches for row in batch))
+        note = " (incomplete: a page failed, not checkpointed)" if failed else ""
+        if not self.write_csv:
+            written = sum(len(batch) for batch in batches)
+            print(f"[{job.engine}] {written} results for '{job.query}' stored{note}")
+        else:
+            written = write_serp_csv(job.output_file, batches)
+            print(f"[{job.engine}] {written} results for '{job.query}' saved to {job.output_file}{note}")
+        if failed:
+            self.incomplete.append(job)
+        elif self.manifest is not None:
+            self.manifest.job_done(job.har, job.query, job.engine, job.output_file, written)
+        return written
+
+    def start(self, engines) -> None:
+        """Set up per-engine limits and the fetch thread pool; call from the event loop."""
+        for engine in engines:
+            if engine not in ENGINES:
+                raise ValueError(f"Engine '{engine}' not supported")
+        engines = set(engines)
+        self._semaphores = {e: asyncio.Semaphore(self.limits[e].concurrency) for e in engines}
+        self._limiters = {
+            e: make_bucket(e, self.limits[e].rate, self.limits[e].burst,
+                           api_key=os.getenv(ENGINES[e].api_key_env) if ENGINES[e].api_key_env else None,
+                           state_path=self.rate_state)
+            for e in engines
+        }
+        workers = sum(self.limits[e].concurrency for e in engines) or 1
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def run(self, jobs: List[SerpJob]) -> List[int]:
+        self.start({job.engine for job in jobs})
+        try:
+            return await asyncio.gather(*(self.run_job(job) for job in jobs))
+        finally:
+            self.close()
+
+
+def run_serp_jobs(jobs: List[SerpJob],
+                  limits: Optional[Dict[str, EngineLimits]] = None,
+                  cache: Optional[SerpCache] = None,
+                  retrier: Optional[Retrier] = None,
+                  rate_state: Optional[str] = None,
+                  store=None,
+                  write_csv: bool = True,
+                  manifest: Optional[RunManifest] = None) -> List[int]:
+    """
+    Blocking entry point: run every job concurrently under per-engine limits.
+    Returns the number of rows written per job, in input order.
+    """
+    return asyncio.run(SerpRunner(limits, cache, retrier, rate_state, store, write_csv, manifest).run(jobs))
@@ -1,16 +1,19 @@
 import os
-import time
-import random
-import csv
 import sys
 import urllib.parse
-import http.client
 from urllib.parse import urlparse
 from oxylabs import RealtimeClient
 from bs4 import BeautifulSoup
 
+from . import http_client
+from .rate_limit import TokenBucket
+from .result_sink import ResultSink
+from .retry import Retrier
+
 # ————— Configuration ————— #
-delay_range = (1, 2)           # min/max delay between requests in seconds
+RATE_PER_SEC = 1.0             # polite request rate (token bucket refill)
+RATE_BURST   = 1               # requests allowed back-to-back
+TIMEOUT      = None            # seconds per request (None: wait), unless --http-timeout is given
 
 # A set of domains you know you want to skip
 EXCLUDED_DOMAINS = {
@@ -26,6 +29,8 @@ EXCLUDED_DOMAINS = {
 # WebScrapingAPI credentials (you can also set this in your env)
 WSA_API_KEY = os.getenv("WSA_API_KEY")
 WSA_HOST    = "api.webscrapingapi.com"
+WSA_ENDPOINT = f"https://{WSA_HOST}/v2"
+WSA_COUNTRY = "us"
 
 
 EAST_COAST_ZIPCODES = [
@@ -177,21 +182,18 @@ def fetch_bing_results(query, start, batch_size):
         })
     )
 
-    # make the proxied request
-    conn = http.client.HTTPSConnection(WSA_HOST)
-    params = urllib.parse.urlencode({
+    # make the proxied request over the shared keep-alive session
+    resp = http_client.request("GET", WSA_ENDPOINT, params={
         "api_key": WSA_API_KEY,
         "url": bing_url,
-        "country": "us",
-    })
-    conn.request("GET", f"/v2?{params}")
-    resp = conn.getresponse()
+        "country": WSA_COUNTRY,
+    }, default_timeout=TIMEOUT)
 
-    # if resp.status != 200:
-    #     print(f"Error fetching from WebScrapingAPI: HTTP {resp.status}")
-    #     sys.exit(1)
+    # surface 429/5xx so the retry policy can back off instead of
+    # treating an error page as "no more results"
+    resp.raise_for_status()
 
-    html = resp.read().decode("utf-8")
+    html = resp.content.decode("utf-8")
     soup = BeautifulSoup(html, "html.parser")
 
     results = []
@@ -211,44 +213,49 @@ def fetch_bing_results(query, start, batch_size):
 
         results.append((title, link))
 
-    # be a good citizen
-    # time.sleep(random.uniform(*delay_range))
     return results
 
-def scrape_bing_to_csv(query, output_file, max_results, batch_size):
-    # Remove existing file so each run starts fresh
-    if os.path.exists(output_file):
-        os.remove(output_file)
+def bing_pages(max_results, batch_size):
+    """Result offsets scrape_bing_to_csv requests, in order."""
+    return list(range(1, max_results, batch_size))
+
+def scrape_bing_to_csv(query, output_file, max_results, batch_size, retrier=None, limiter=None, sink=None):
+    retrier = retrier or Retrier()
+    # be a good citizen
+    limiter = limiter or TokenBucket(RATE_PER_SEC, RATE_BURST)
+    # rows go to a temp file that replaces output_file only once the query is done
+    sink = sink or ResultSink()
+    out = sink.open(output_file)
+
+    def fetch_page(offset):
+        limiter.acquire()
+        return fetch_bing_results(query, offset, batch_size)
 
     ## OVERRIDE USER
     # batch_size=20
 
     total_written = 0
-    header_written = False
-
-    for offset in range(1, max_results, batch_size):
-        try:
-            batch = fetch_bing_results(query, offset, batch_size)
-            if not batch:
-                print(f"No more results at offset {offset}. Stopping.")
-                break
 
-            # Append this batch to CSV
-            with open(output_file, "a", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-                # write header once
-                if not header_written:
-                    writer.writerow(["Page Title", "URL"])
-                    header_written = True
+    try:
+        for offset in bing_pages(max_results, batch_size):
+            try:
+                batch = retrier.call("bing", fetch_page, offset)
+                if not batch:
+                    print(f"No more results at offset {offset}. Stopping.")
+                    break
 
-                for title, link in batch:
-                    total_written += 1
-                    writer.writerow([title, link])
+                out.write_rows(batch)
+                total_written += len(batch)
 
-            print(f"Fetched & saved {len(batch)} items from {offset}–{offset+batch_size-1} (total {total_written}).")
+                print(f"Fetched & saved {len(batch)} items from {offset}–{offset+batch_size-1} (total {total_written}).")
 
-        except Exception as e:
-            print(f"Error at offset {offset}: {e}. Retrying after delay.")
-        time.sleep(random.uniform(*delay_range))
+            except Exception as e:
+                # later batches would sit at the wrong ranks; keep the complete prefix only
+                print(f"Error at offset {offset}: {e}. Stopping; results end at rank {total_written} (incomplete).")
+                break
+    except BaseException:
+        sink.abort(output_file)
+        raise
 
+    sink.commit(output_file)
     print(f"\nDone! {total_written} total results saved to {output_file}")
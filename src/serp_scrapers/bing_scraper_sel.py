@@ -2,16 +2,28 @@
 Bing Search Scraper Module
 
 Provides functions to scrape Bing results with Selenium, including
-proxy rotation and User-Agent rotation. Data is flushed to CSV per page
-so progress is saved incrementally. Intended for import by a
-separate main.py (or other caller).
+proxy rotation and User-Agent rotation. Pages are scraped in parallel on a
+pool of warmed headless drivers (DriverPool); each driver is recycled,
+with a fresh proxy and User-Agent, after a set number of pages. Data is
+flushed to CSV per page so progress is saved incrementally. Intended for
+import by a separate main.py (or other caller).
+
+`base_url` can point the scraper at a local static server that serves
+Bing-like result pages, for testing without hitting Bing
+(see benchmarks/bench_selenium_pool.py).
 
 Dependencies:
     pip install selenium webdriver_manager
 """
 import csv
+import queue
+import threading
 import time
 import random
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -22,6 +34,14 @@ from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+# —— Configuration —— #
+BING_URL                 = "https://www.bing.com/search"
+RESULTS_PER_PAGE         = 10
+DEFAULT_POOL_SIZE        = 3        # warmed drivers, i.e. pages scraped in parallel
+DEFAULT_PAGES_PER_DRIVER = 5        # pages before a driver is recycled (new proxy / User-Agent)
+DELAY_RANGE              = (1, 3)   # seconds a driver rests after each page
+# ———————— #
+
 # List of User-Agent strings to rotate
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36",
@@ -62,25 +82,174 @@ def build_options(headless: bool = True, proxy: str = None) -> Options:
     return options
 
 
+@lru_cache(maxsize=None)
+def driver_path() -> str:
+    """
+    Path of the chromedriver binary. ChromeDriverManager().install() checks
+    (and may download) the driver, so it runs once per process.
+    """
+    return ChromeDriverManager().install()
+
+
+def new_driver(headless: bool = True, proxy: str = None) -> webdriver.Chrome:
+    return webdriver.Chrome(service=Service(driver_path()), options=build_options(headless, proxy))
+
+
+class DriverPool:
+    """
+    `size` warmed Chrome drivers shared by page scrapes. A driver is quit and
+    replaced by a new one (random proxy from `proxy_list`, random
+    User-Agent) after `pages_per_driver` pages, or after an error.
+    Use as a context manager, or call close().
+    """
+
+    def __init__(self,
+                 size: int = DEFAULT_POOL_SIZE,
+                 proxy_list: list = None,
+                 headless: bool = True,
+                 pages_per_driver: int = DEFAULT_PAGES_PER_DRIVER):
+        self.size = max(1, size)
+        self.proxy_list = proxy_list
+        self.headless = headless
+        self.pages_per_driver = max(1, pages_per_driver)
+        self.recycled = 0
+        self._idle = queue.Queue()
+        self._live = set()
+        self._lock = threading.Lock()
+        print(f"[Log] Warming {self.size} drivers")
+        # start the browsers in parallel: startup dominates
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            for driver in executor.map(lambda _: self._spawn(), range(self.size)):
+                self._idle.put((driver, 0))
+
+    def _spawn(self):
+        proxy = random.choice(self.proxy_list) if self.proxy_list else None
+        try:
+            driver = new_driver(self.headless, proxy)
+        except Exception as e:
+            print(f"[Log] Could not start driver: {e}")
+            return None
+        with self._lock:
+            self._live.add(driver)
+        return driver
+
+    def _retire(self, driver) -> None:
+        with self._lock:
+            self._live.discard(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver for one page."""
+        driver, used = self._idle.get()
+        if driver is None:
+            # a replacement failed to start earlier; try again
+            driver = self._spawn()
+            if driver is None:
+                self._idle.put((None, 0))
+                raise RuntimeError("No Chrome driver available")
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            used += 1
+            if broken or used >= self.pages_per_driver:
+                self._retire(driver)
+                self.recycled += 1
+                driver, used = self._spawn(), 0
+            self._idle.put((driver, used))
+
+    def close(self) -> None:
+        with self._lock:
+            drivers, self._live = list(self._live), set()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self) -> "DriverPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def scrape_page(driver, query: str, page: int, base_url: str = BING_URL) -> tuple:
+    """
+    Load one SERP page in `driver`.
+    Returns (results, number of result items on the page).
+    """
+    start = (page - 1) * RESULTS_PER_PAGE + 1
+    url = base_url + "?" + urllib.parse.urlencode({"q": query, "first": start, "mkt": "en-US", "cc": "US"})
+    print(f"[Log] Navigating to: {url}")
+    driver.get(url)
+
+    try:
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, 'li.b_algo')))
+    except Exception:
+        print(f"[Log] No results found or timeout on page {page}.")
+        return [], 0
+
+    items = driver.find_elements(By.CSS_SELECTOR, 'li.b_algo')
+    print(f"[Log] Found {len(items)} items on page {page}")
+
+    page_results = []
+    for item in items:
+        try:
+            el = item.find_element(By.CSS_SELECTOR, 'h2 a')
+            title = el.text
+            link = el.get_attribute('href')
+        except:
+            continue
+        snippet = ''
+        try:
+            snippet = item.find_element(By.CSS_SELECTOR, 'p').text
+        except:
+            pass
+        page_results.append({'title': title, 'url': link, 'snippet': snippet})
+    return page_results, len(items)
+
+
 def scrape_bing(query: str,
                 proxy_list: list = None,
                 headless: bool = True,
-                output_file: str = None) -> list:
+                output_file: str = None,
+                pool: DriverPool = None,
+                max_pages: int = None,
+                base_url: str = BING_URL,
+                delay_range: tuple = DELAY_RANGE) -> list:
     """
     Scrape all Bing SERP pages for a query, rotating proxies and UAs.
     Immediately flushes each page's results to CSV if `output_file` is set.
 
+    Pages are fetched in parallel, pool.size at a time, and written in
+    page order; scraping stops at the first page with fewer than 10
+    results, so up to pool.size - 1 pages past the end may be loaded.
+
     Args:
         query (str): Search query.
-        proxy_list (list): List of "host:port" proxies.
-        headless (bool): Run in headless mode if True.
+        proxy_list (list): List of "host:port" proxies (used when no pool is given).
+        headless (bool): Run in headless mode if True (used when no pool is given).
         output_file (str): Path to CSV for incremental saving (optional).
+        pool (DriverPool): Shared driver pool; a temporary one is created if None.
+        max_pages (int): Stop after this many pages (optional).
+        base_url (str): Search endpoint, e.g. a local test server.
+        delay_range (tuple): Seconds (min, max) a driver rests after each page.
 
     Returns:
         List[Dict]: Each dict has 'title', 'url', 'snippet'.
     """
     all_results = []
-    page = 1
+    own_pool = pool is None
+    if own_pool:
+        pool = DriverPool(DEFAULT_POOL_SIZE, proxy_list, headless)
 
     # Prepare CSV writer if needed
     writer = None
@@ -91,77 +260,58 @@ def scrape_bing(query: str,
         writer.writeheader()
         print(f"[Log] Output file '{output_file}' opened for writing.")
 
-    print(f"[Log] Beginning scrape for query: '{query}'")
-    while True:
-        print(f"[Log] Starting page {page}")
-        proxy = random.choice(proxy_list) if proxy_list else None
-        options = build_options(headless, proxy)
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
-        )
-        wait = WebDriverWait(driver, 10)
-
-        start = (page - 1) * 10 + 1
-        url = (
-            "https://www.bing.com/search?"
-            f"q={query}&first={start}&mkt=en-US&cc=US"
-        )
-        print(f"[Log] Navigating to: {url}")
-        driver.get(url)
-
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'li.b_algo')))
-        except Exception:
-            print(f"[Log] No results found or timeout on page {page}. Ending.")
-            driver.quit()
-            break
-
-        items = driver.find_elements(By.CSS_SELECTOR, 'li.b_algo')
-        print(f"[Log] Found {len(items)} items on page {page}")
-        if not items:
-            driver.quit()
-            break
+    def fetch(page):
+        with pool.driver() as driver:
+            print(f"[Log] Starting page {page}")
+            result = scrape_page(driver, query, page, base_url)
+            if delay_range:
+                time.sleep(random.uniform(*delay_range))
+            return result
 
-        page_results = []
-        for item in items:
-            try:
-                el = item.find_element(By.CSS_SELECTOR, 'h2 a')
-                title = el.text
-                link = el.get_attribute('href')
-            except:
-                continue
-            snippet = ''
-            try:
-                snippet = item.find_element(By.CSS_SELECTOR, 'p').text
-            except:
-                pass
-            result = {'title': title, 'url': link, 'snippet': snippet}
-            page_results.append(result)
-
-        # Write this page's results immediately
-        if writer and page_results:
-            writer.writerows(page_results)
-            csv_file.flush()
-            print(f"[Log] Saved {len(page_results)} results from page {page} to CSV.")
-
-        all_results.extend(page_results)
-        driver.quit()
-        print(f"[Log] Completed page {page}")
+    print(f"[Log] Beginning scrape for query: '{query}'")
+    try:
+        with ThreadPoolExecutor(max_workers=pool.size) as executor:
+            page = 1
+            done = False
+            while not done and (max_pages is None or page <= max_pages):
+                last = page + pool.size - 1 if max_pages is None else min(page + pool.size - 1, max_pages)
+                window = list(range(page, last + 1))
+                futures = [executor.submit(fetch, p) for p in window]
+                for p, future in zip(window, futures):
+                    if done:
+                        future.cancel()
+                        continue
+                    try:
+                        page_results, n_items = future.result()
+                    except Exception as e:
+                        print(f"[Log] Error on page {p}: {e}. Ending.")
+                        done = True
+                        continue
+                    if not n_items:
+                        print(f"[Log] No results on page {p}. Ending.")
+                        done = True
+                        continue
 
-        # Check if this is the last page: if fewer than 10 results, end
-        if len(items) < 10:
-            print(f"[Log] Detected last page (only {len(items)} results). Ending.")
-            break
+                    # Write this page's results immediately
+                    if writer and page_results:
+                        writer.writerows(page_results)
+                        csv_file.flush()
+                        print(f"[Log] Saved {len(page_results)} results from page {p} to CSV.")
 
-        page += 1
-        delay = random.uniform(1, 3)
-        print(f"[Log] Sleeping for {delay:.2f} seconds before next page")
-        time.sleep(delay)
+                    all_results.extend(page_results)
+                    print(f"[Log] Completed page {p}")
 
-    if csv_file:
-        csv_file.close()
-        print(f"[Log] CSV file '{output_file}' closed.")
+                    # Check if this is the last page: if fewer than 10 results, end
+                    if n_items < RESULTS_PER_PAGE:
+                        print(f"[Log] Detected last page (only {n_items} results). Ending.")
+                        done = True
+                page = last + 1
+    finally:
+        if own_pool:
+            pool.close()
+        if csv_file:
+            csv_file.close()
+            print(f"[Log] CSV file '{output_file}' closed.")
 
     print(f"[Log] Scraping finished. Total results: {len(all_results)}")
     return all_results
@@ -170,7 +320,8 @@ def scrape_bing(query: str,
 def run_scraper(query: str,
                 proxy_list: list = None,
                 headless: bool = True,
-                output_file: str = 'results.csv') -> list:
+                output_file: str = 'results.csv',
+                pool: DriverPool = None) -> list:
     """
     High-level function: scrape Bing for `query`, save to CSV incrementally,
     and return results.
@@ -180,10 +331,11 @@ def run_scraper(query: str,
         proxy_list (list): List of "host:port" proxies.
         headless (bool): Run in headless mode if True.
         output_file (str): Path to CSV for saving.
+        pool (DriverPool): Driver pool to reuse across queries (optional).
 
     Returns:
         List[Dict]: Scraped results.
     """
     print(f"[Log] run_scraper called with query='{query}', output_file='{output_file}'")
-    data = scrape_bing(query, proxy_list, headless, output_file)
+    data = scrape_bing(query, proxy_list, headless, output_file, pool=pool)
     return data
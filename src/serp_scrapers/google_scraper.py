@@ -1,12 +1,18 @@
 import os
 import time
-import csv
 import requests
 from dotenv import load_dotenv
 
+from . import http_client
+from .rate_limit import TokenBucket
+from .result_sink import ResultSink
+from .retry import Retrier
+
 # —— Configuration —— #
 ENDPOINT    = "https://google.serper.dev/search"
-# delay_range = (0.5, 1.5)              # polite delay between requests (s)
+RATE_PER_SEC = 5.0                    # request rate (token bucket refill)
+RATE_BURST   = 5                      # requests allowed back-to-back
+TIMEOUT      = 10                     # seconds per request, unless --http-timeout is given
 
 load_dotenv() # take environment variables from .env.
 # ———————— #
@@ -27,7 +33,8 @@ def fetch_serper_page(query, page, page_size):
     }
 
     try:
-        resp = requests.post(ENDPOINT, json=payload, headers=headers, timeout=10)
+        resp = http_client.request("POST", ENDPOINT, json=payload, headers=headers,
+                                    default_timeout=TIMEOUT)
         resp.raise_for_status()
 
     except requests.exceptions.HTTPError as e:
@@ -36,7 +43,8 @@ def fetch_serper_page(query, page, page_size):
         if resp.status_code == 400 and page_size > 20:
             print("Check")
             retry_payload = {"q": query, "page": page, "num": 20}
-            resp = requests.post(ENDPOINT, json=retry_payload, headers=headers, timeout=10)
+            resp = http_client.request("POST", ENDPOINT, json=retry_payload, headers=headers,
+                                        default_timeout=TIMEOUT)
             resp.raise_for_status()
         else:
             # re-raise any other errors
@@ -51,44 +59,52 @@ def fetch_serper_page(query, page, page_size):
             items.append((title, link))
     return items
 
-def scrape_google_to_csv(query, max_results, page_size, output_file):
-    # fresh CSV
-    if os.path.exists(output_file):
-        os.remove(output_file)
-
-    total_written = 0
-    header_written = False
+def serper_pages(max_results, page_size):
+    """Page numbers scrape_google_to_csv requests, in order."""
     pages_needed = (max_results + page_size - 1) // page_size
+    return list(range(1, pages_needed + 1))
 
-    for page in range(1, pages_needed + 1):
-        try:
-            batch = fetch_serper_page(query, page, page_size)
-            if not batch:
-                print(f"No results returned on page {page}. Stopping.")
-                break
-
-            with open(output_file, "a", newline="", encoding="utf-8") as csvfile:
-                writer = csv.writer(csvfile)
-                if not header_written:
-                    writer.writerow(["Page Title", "URL"])
-                    header_written = True
+def scrape_google_to_csv(query, max_results, page_size, output_file, retrier=None, limiter=None, sink=None):
+    retrier = retrier or Retrier()
+    limiter = limiter or TokenBucket(RATE_PER_SEC, RATE_BURST)
+    # rows go to a temp file that replaces output_file only once the query is done
+    sink = sink or ResultSink()
+    out = sink.open(output_file)
 
-                for title, link in batch:
-                    total_written += 1
-                    writer.writerow([title, link])
+    def fetch_page(page):
+        limiter.acquire()
+        return fetch_serper_page(query, page, page_size)
 
-            start_idx = (page - 1) * page_size + 1
-            end_idx   = start_idx + len(batch) - 1
-            print(f"Page {page}: saved {len(batch)} items ({start_idx}–{end_idx}, total {total_written}).")
+    total_written = 0
 
-            if total_written >= max_results:
-                print("Reached max_results limit.")
+    try:
+        for page in serper_pages(max_results, page_size):
+            try:
+                batch = retrier.call("google", fetch_page, page)
+                if not batch:
+                    print(f"No results returned on page {page}. Stopping.")
+                    break
+
+                out.write_rows(batch)
+                total_written += len(batch)
+
+                start_idx = (page - 1) * page_size + 1
+                end_idx   = start_idx + len(batch) - 1
+                print(f"Page {page}: saved {len(batch)} items ({start_idx}–{end_idx}, total {total_written}).")
+
+                if total_written >= max_results:
+                    print("Reached max_results limit.")
+                    break
+
+            except Exception as e:
+                # later pages would sit at the wrong ranks; keep the complete prefix only
+                print(f"Error on page {page}: {e}. Stopping; results end at rank {total_written} (incomplete).")
                 break
+    except BaseException:
+        sink.abort(output_file)
+        raise
 
-        except Exception as e:
-            print(f"Error on page {page}: {e}. Retrying after delay.")
-        # time.sleep(__import__("random").uniform(*delay_range))
-
+    sink.commit(output_file)
     print(f"\nDone! {total_written} total results saved to {output_file}")
 
 # import os
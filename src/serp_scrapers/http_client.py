@@ -0,0 +1,75 @@
+"""
+Shared HTTP client for the SERP scrapers.
+
+One keep-alive requests.Session per process, with a sized connection pool,
+so repeated calls to the same API reuse TCP/TLS connections instead of
+paying a handshake per page.
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# —— Configuration —— #
+DEFAULT_POOL_SIZE = 10      # connections kept alive per host
+# ———————— #
+
+# timeout None: each scraper keeps its own default (see request())
+_settings = {"pool_size": DEFAULT_POOL_SIZE, "timeout": None}
+_session = None
+_session_pid = None
+_lock = threading.Lock()
+
+
+def configure_http(pool_size=None, timeout=None):
+    """
+    Change pool size / timeout. A timeout (seconds, or a (connect, read)
+    tuple) overrides every scraper's own default. The current session is
+    closed and a new one is built on next use.
+    """
+    if pool_size is not None:
+        _settings["pool_size"] = pool_size
+    if timeout is not None:
+        _settings["timeout"] = timeout
+    close_session()
+
+
+def _build_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=_settings["pool_size"],
+        pool_maxsize=_settings["pool_size"],
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """Return this process's shared session (rebuilt after a fork)."""
+    global _session, _session_pid
+    with _lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = _build_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+def close_session():
+    global _session, _session_pid
+    with _lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+
+
+def request(method, url, default_timeout=None, **kwargs):
+    """
+    requests.request over the shared session. The timeout is the one set by
+    configure_http() if any, else the caller's `default_timeout`.
+    """
+    timeout = _settings["timeout"]
+    kwargs.setdefault("timeout", default_timeout if timeout is None else timeout)
+    return get_session().request(method, url, **kwargs)
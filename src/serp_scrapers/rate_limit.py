@@ -0,0 +1,103 @@
+"""
+Token-bucket rate limiting for SERP requests.
+
+A bucket refills at `rate` tokens per second up to `burst`; each request
+takes one token. TokenBucket lives in one process. SharedTokenBucket keeps
+its state in a SQLite file, so every process pointed at the same file
+(and the same engine / API key) draws from a single quota.
+"""
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """In-process bucket. rate <= 0 means unlimited."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token now; returns how long the caller must wait before using it."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate) - 1
+            self._updated = now
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Bucket whose state is a row in a SQLite database, updated under an
+    immediate (write) transaction so concurrent processes serialize on it.
+    """
+
+    def __init__(self, path: str, key: str, rate: float, burst: int = 1):
+        super().__init__(rate, burst)
+        self.path = path
+        self.key = key
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+
+    def reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # wall clock: it has to agree between processes
+                now = time.time()
+                row = self._db.execute(
+                    "SELECT tokens, updated FROM buckets WHERE key = ?", (self.key,)).fetchone()
+                tokens, updated = row if row else (float(self.burst), now)
+                tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate) - 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)",
+                    (self.key, tokens, now))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return max(0.0, -tokens / self.rate)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def bucket_key(engine: str, api_key: Optional[str]) -> str:
+    """Bucket identity: engine plus a fingerprint (never the secret) of the API key."""
+    fingerprint = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12] if api_key else "anonymous"
+    return f"{engine}:{fingerprint}"
+
+
+def make_bucket(engine: str,
+                rate: float,
+                burst: int = 1,
+                api_key: Optional[str] = None,
+                state_path: Optional[str] = None) -> TokenBucket:
+    """Shared bucket when `state_path` is given, otherwise a per-process one."""
+    if state_path:
+        return SharedTokenBucket(state_path, bucket_key(engine, api_key), rate, burst)
+    return TokenBucket(rate, burst)
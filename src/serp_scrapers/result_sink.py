@@ -0,0 +1,124 @@
+"""
+Buffered, atomic CSV output for SERP results.
+
+Rows are buffered in memory and written through one open handle per
+output, into a temporary file beside it; a flush happens once
+`flush_rows` rows are pending or `flush_interval` seconds have passed.
+commit() renames the temporary file over the output in one step, so an
+interrupted run leaves either the previous CSV or the complete new one,
+never a truncated file.
+"""
+import csv
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+Row = Tuple[str, str]
+
+# —— Configuration —— #
+CSV_HEADER          = ["Page Title", "URL"]
+FLUSH_ROWS          = 500       # pending rows that trigger a write
+FLUSH_INTERVAL      = 5.0       # seconds between writes while rows are pending
+# ———————— #
+
+
+class CsvSink:
+    """
+    One output CSV. Like the scrapers' old writer it has a header row and
+    is not created at all when no rows were written.
+    """
+
+    def __init__(self,
+                 output_file: str,
+                 flush_rows: int = FLUSH_ROWS,
+                 flush_interval: float = FLUSH_INTERVAL,
+                 header: Optional[List[str]] = None):
+        self.output_file = output_file
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.header = CSV_HEADER if header is None else header
+        self.rows_written = 0
+        self.tmp_file = f"{output_file}.{os.getpid()}.tmp"
+        self._pending: List[Row] = []
+        self._last_flush = time.monotonic()
+        self._handle = None
+        self._writer = None
+
+    def write_rows(self, rows: Iterable[Row]) -> None:
+        self._pending.extend(rows)
+        if len(self._pending) >= self.flush_rows or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        if self._handle is None:
+            self._handle = open(self.tmp_file, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._handle)
+            self._writer.writerow(self.header)
+        self._writer.writerows(self._pending)
+        self._handle.flush()
+        self.rows_written += len(self._pending)
+        self._pending = []
+
+    def commit(self) -> int:
+        """Move the finished CSV into place (or remove a stale one if there were no rows). Returns rows written."""
+        self.flush()
+        if self._handle is None:
+            if os.path.exists(self.output_file):
+                os.remove(self.output_file)
+            return 0
+        self._handle.close()
+        self._handle = None
+        os.replace(self.tmp_file, self.output_file)
+        return self.rows_written
+
+    def abort(self) -> None:
+        """Drop everything written so far; the existing output file is left untouched."""
+        self._pending = []
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            os.remove(self.tmp_file)
+
+    def __enter__(self) -> "CsvSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class ResultSink:
+    """Shared sink keeping one CsvSink (and file handle) per open output."""
+
+    def __init__(self, flush_rows: int = FLUSH_ROWS, flush_interval: float = FLUSH_INTERVAL):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._outputs: Dict[str, CsvSink] = {}
+
+    def open(self, output_file: str) -> CsvSink:
+        sink = self._outputs.get(output_file)
+        if sink is None:
+            sink = self._outputs[output_file] = CsvSink(output_file, self.flush_rows, self.flush_interval)
+        return sink
+
+    def write(self, output_file: str, rows: Iterable[Row]) -> None:
+        self.open(output_file).write_rows(rows)
+
+    def commit(self, output_file: str) -> int:
+        sink = self._outputs.pop(output_file, None)
+        return sink.commit() if sink is not None else 0
+
+    def abort(self, output_file: str) -> None:
+        sink = self._outputs.pop(output_file, None)
+        if sink is not None:
+            sink.abort()
+
+    def close(self) -> None:
+        """Abort outputs never committed (their runs did not finish)."""
+        for output_file in list(self._outputs):
+            self.abort(output_file)
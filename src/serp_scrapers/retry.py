@@ -0,0 +1,203 @@
+"""
+Shared retry policy and per-engine circuit breaker for SERP requests.
+
+Transient failures (429, 5xx, connection errors, timeouts) are retried with
+jittered exponential backoff, honouring Retry-After, within a per-engine
+retry budget. After N consecutive transient failures an engine's breaker
+opens and every caller for that engine pauses for a cool-down instead of
+hammering it.
+"""
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+import requests
+
+# —— Configuration —— #
+RETRYABLE_STATUS  = frozenset({429, 500, 502, 503, 504})
+BREAKER_THRESHOLD = 5       # consecutive transient failures before pausing an engine
+BREAKER_COOLDOWN  = 30.0    # seconds an open breaker pauses the engine
+# ———————— #
+
+
+class RetryPolicy(NamedTuple):
+    max_attempts: int = 4           # first try + retries, per request
+    base_delay: float = 1.0         # seconds; doubled per attempt
+    max_delay: float = 30.0         # cap on a single backoff
+    max_retry_after: float = 300.0  # cap on an honoured Retry-After
+    budget: int = 100               # total retries per engine per run
+
+
+class RetryStats:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.breaker_trips = 0
+        self.backoff_seconds = 0.0
+
+    def __repr__(self):
+        return (f"requests={self.requests} retries={self.retries} failures={self.failures} "
+                f"breaker_trips={self.breaker_trips} backoff={self.backoff_seconds:.1f}s")
+
+
+def status_code(exc: BaseException) -> Optional[int]:
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    status = status_code(exc)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError))
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta-seconds or HTTP date), if any."""
+    response = getattr(exc, "response", None)
+    value = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures. While open, wait_time() is
+    the remaining pause; afterwards it is half-open, so a single further
+    failure re-opens it and a success closes it.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        return max(0.0, self.open_until - time.monotonic())
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+
+    def record_failure(self) -> bool:
+        """Returns True if this failure opened the breaker."""
+        with self._lock:
+            self.failures += 1
+            if self.failures < self.threshold:
+                return False
+            self.open_until = time.monotonic() + self.cooldown
+            self.failures = self.threshold - 1
+            return True
+
+
+class Retrier:
+    """
+    Applies a RetryPolicy and per-engine CircuitBreakers; one instance per run
+    so `stats` describe that run.
+    """
+
+    def __init__(self,
+                 policy: Optional[RetryPolicy] = None,
+                 breaker_threshold: int = BREAKER_THRESHOLD,
+                 breaker_cooldown: float = BREAKER_COOLDOWN,
+                 rng: Optional[random.Random] = None):
+        self.policy = policy or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.stats: Dict[str, RetryStats] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+
+    def _engine(self, engine: str):
+        with self._lock:
+            if engine not in self.stats:
+                self.stats[engine] = RetryStats()
+                self._breakers[engine] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+            return self.stats[engine], self._breakers[engine]
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt` (1-based)."""
+        ceiling = min(self.policy.max_delay, self.policy.base_delay * 2 ** (attempt - 1))
+        return self._rng.uniform(0, ceiling)
+
+    def _on_failure(self, engine: str, exc: BaseException, attempt: int) -> Optional[float]:
+        """Record a failed attempt; return the delay before retrying, or None to give up."""
+        stats, breaker = self._engine(engine)
+        if not is_retryable(exc):
+            stats.failures += 1
+            return None
+        if breaker.record_failure():
+            stats.breaker_trips += 1
+            print(f"[{engine}] {breaker.threshold} consecutive failures; "
+                  f"pausing engine for {breaker.cooldown:g}s")
+        with self._lock:
+            if attempt >= self.policy.max_attempts or stats.retries >= self.policy.budget:
+                stats.failures += 1
+                return None
+            stats.retries += 1
+        delay = self.backoff(attempt)
+        requested = retry_after(exc)
+        if requested is not None:
+            delay = max(delay, min(requested, self.policy.max_retry_after))
+        stats.backoff_seconds += delay
+        return delay
+
+    def call(self, engine: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call `fn` with retries, blocking the current thread while backing off."""
+        stats, breaker = self._engine(engine)
+        attempt = 0
+        while True:
+            attempt += 1
+            time.sleep(breaker.wait_time())
+            stats.requests += 1
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                delay = self._on_failure(engine, e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+    async def call_async(self, engine: str, attempt_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await `attempt_fn()` with retries; backoff and breaker pauses do not block the loop."""
+        stats, breaker = self._engine(engine)
+        attempt = 0
+        while True:
+            attempt += 1
+            pause = breaker.wait_time()
+            if pause:
+                await asyncio.sleep(pause)
+            stats.requests += 1
+            try:
+                result = await attempt_fn()
+            except Exception as e:
+                delay = self._on_failure(engine, e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            breaker.record_success()
+            return result
+
+    def summary(self) -> str:
+        if not self.stats:
+            return "SERP retries: no requests made"
+        return "\n".join(f"SERP retries [{engine}]: {stats!r}" for engine, stats in sorted(self.stats.items()))
@@ -0,0 +1,144 @@
+"""
+Checkpoint of a SERP run, so an interrupted run can be resumed.
+
+A manifest is a small SQLite file next to the run's output folders. It
+holds the run's settings and every completed unit of work:
+  pages: (har, query, engine, page) -> the rows that page returned
+  jobs:  (har, query, engine) whose output was fully written
+A resumed run skips finished jobs and serves finished pages from the
+manifest, so only the missing pages are fetched again.
+"""
+import glob
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+Row = Tuple[str, str]
+
+MANIFEST_SUFFIX = ".manifest.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    har       TEXT NOT NULL,
+    query     TEXT NOT NULL,
+    engine    TEXT NOT NULL,
+    page      INTEGER NOT NULL,
+    page_size INTEGER NOT NULL,
+    rows      TEXT NOT NULL,
+    done_at   REAL NOT NULL,
+    PRIMARY KEY (har, query, engine, page, page_size)
+);
+CREATE INDEX IF NOT EXISTS pages_query ON pages (query, engine, page, page_size);
+CREATE TABLE IF NOT EXISTS jobs (
+    har         TEXT NOT NULL,
+    query       TEXT NOT NULL,
+    engine      TEXT NOT NULL,
+    output_file TEXT NOT NULL,
+    rows        INTEGER NOT NULL,
+    done_at     REAL NOT NULL,
+    PRIMARY KEY (har, query, engine)
+);
+"""
+
+
+def manifest_path(output_dir: str, run_id: str) -> str:
+    return os.path.join(output_dir, f"run_{run_id}{MANIFEST_SUFFIX}")
+
+
+def find_manifest(path: str) -> str:
+    """`path` itself if it is a manifest file, else the newest manifest in directory `path`."""
+    if os.path.isfile(path):
+        return path
+    candidates = sorted(glob.glob(os.path.join(path, f"run_*{MANIFEST_SUFFIX}")))
+    if not candidates:
+        raise FileNotFoundError(f"No run manifest (run_*{MANIFEST_SUFFIX}) in {path}")
+    return candidates[-1]
+
+
+class RunManifest:
+    """
+    Create one with RunManifest.create() for a new run, or RunManifest(path)
+    to reopen an existing one.
+    """
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.executescript(_SCHEMA)
+
+    @classmethod
+    def create(cls, path: str, run_id: str, config: Dict[str, Any]) -> "RunManifest":
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        sqlite3.connect(path).close()
+        manifest = cls(path)
+        with manifest._db:
+            manifest._db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                ("run_id", run_id),
+                ("config", json.dumps(config)),
+                ("started_at", str(time.time())),
+            ])
+        return manifest
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def run_id(self) -> str:
+        return self._meta("run_id")
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        return json.loads(self._meta("config") or "{}")
+
+    @property
+    def finished(self) -> bool:
+        return self._meta("finished_at") is not None
+
+    def get_page(self, har: Optional[str], query: str, engine: str, page: int, page_size: int) -> Optional[List[Row]]:
+        """Rows of a finished page; har=None accepts the page from any HAR."""
+        sql = "SELECT rows FROM pages WHERE query = ? AND engine = ? AND page = ? AND page_size = ?"
+        params: tuple = (query, engine, page, page_size)
+        if har is not None:
+            sql += " AND har = ?"
+            params += (har,)
+        row = self._db.execute(sql + " LIMIT 1", params).fetchone()
+        return [tuple(r) for r in json.loads(row[0])] if row else None
+
+    def page_done(self, har: str, query: str, engine: str, page: int, page_size: int, rows: List[Row]) -> None:
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (har, query, engine, page, page_size, json.dumps(rows, ensure_ascii=False), time.time()))
+
+    def get_job(self, har: str, query: str, engine: str) -> Optional[Tuple[str, int]]:
+        """(output_file, rows written) of a finished job, or None."""
+        row = self._db.execute(
+            "SELECT output_file, rows FROM jobs WHERE har = ? AND query = ? AND engine = ?",
+            (har, query, engine)).fetchone()
+        return tuple(row) if row else None
+
+    def job_done(self, har: str, query: str, engine: str, output_file: str, rows: int) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?)",
+                             (har, query, engine, output_file, rows, time.time()))
+
+    def mark_finished(self) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('finished_at', ?)", (str(time.time()),))
+
+    def close(self) -> None:
+        self._db.close()
+
+    def summary(self) -> str:
+        pages = self._db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        jobs = self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return f"Run manifest: {jobs} jobs and {pages} pages completed ({self.path})"
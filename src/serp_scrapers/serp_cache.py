@@ -0,0 +1,126 @@
+"""
+Persistent on-disk cache of SERP pages.
+
+Pages are stored in SQLite under a content-addressed key built from
+(engine, normalized query, page/offset, page size, geo), with a TTL and a
+total size cap enforced by evicting the least recently used pages.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import List, Optional, Tuple
+
+Row = Tuple[str, str]
+
+# —— Configuration —— #
+DEFAULT_CACHE_FILE = "serp_cache.sqlite3"
+DEFAULT_TTL        = 7 * 24 * 3600      # seconds
+DEFAULT_MAX_BYTES  = 256 * 1024 * 1024
+EVICT_EVERY        = 200                # puts between eviction passes
+# ———————— #
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key         TEXT PRIMARY KEY,
+    engine      TEXT NOT NULL,
+    query       TEXT NOT NULL,
+    page        INTEGER NOT NULL,
+    page_size   INTEGER NOT NULL,
+    geo         TEXT NOT NULL,
+    fetched_at  REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size        INTEGER NOT NULL,
+    rows        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search string."""
+    return " ".join(query.split()).lower()
+
+
+def cache_key(engine: str, query: str, page: int, page_size: int, geo: str = "") -> str:
+    raw = json.dumps([engine, normalize_query(query), page, page_size, geo])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SerpCache:
+    """
+    SQLite-backed SERP page cache. With `refresh`, lookups always miss but
+    fetched pages are still stored, replacing stale entries.
+    """
+
+    def __init__(self,
+                 path: str = DEFAULT_CACHE_FILE,
+                 ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 refresh: bool = False):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.executescript(_SCHEMA)
+
+    def get(self, engine: str, query: str, page: int, page_size: int, geo: str = "") -> Optional[List[Row]]:
+        if self.refresh:
+            self.misses += 1
+            return None
+        key = cache_key(engine, query, page, page_size, geo)
+        now = time.time()
+        row = self._db.execute(
+            "SELECT rows, fetched_at FROM pages WHERE key = ?", (key,)).fetchone()
+        if row is None or (self.ttl and now - row[1] > self.ttl):
+            self.misses += 1
+            return None
+        with self._db:
+            self._db.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (now, key))
+        self.hits += 1
+        return [tuple(r) for r in json.loads(row[0])]
+
+    def put(self, engine: str, query: str, page: int, page_size: int, rows: List[Row], geo: str = "") -> None:
+        payload = json.dumps(rows, ensure_ascii=False)
+        now = time.time()
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key(engine, query, page, page_size, geo), engine, normalize_query(query),
+                 page, page_size, geo, now, now, len(payload.encode("utf-8")), payload))
+        self._puts += 1
+        if self._puts % EVICT_EVERY == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired pages, then least recently used ones above max_bytes. Returns pages removed."""
+        removed = 0
+        with self._db:
+            if self.ttl:
+                removed += self._db.execute(
+                    "DELETE FROM pages WHERE fetched_at < ?", (time.time() - self.ttl,)).rowcount
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            if self.max_bytes and total > self.max_bytes:
+                doomed = []
+                for key, size in self._db.execute("SELECT key, size FROM pages ORDER BY accessed_at"):
+                    if total <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    total -= size
+                self._db.executemany("DELETE FROM pages WHERE key = ?", doomed)
+                removed += len(doomed)
+        return removed
+
+    def close(self) -> None:
+        self.evict()
+        self._db.close()
+
+    def summary(self) -> str:
+        return f"SERP cache: {self.hits} hits, {self.misses} misses ({self.path})"
@@ -0,0 +1,103 @@
+"""
+har_stream.iter_har_entries against a json.load reference.
+
+Each document is scanned with chunk sizes down to one character, so chunk
+boundaries fall inside strings, escapes and between tokens.
+"""
+import io
+import json
+
+import pytest
+
+from chatgpt_scraper.har_stream import iter_har_entries, url_matcher
+
+TARGET = "https://chatgpt.com/backend-api/f/conversation"
+CHUNK_SIZES = [1, 2, 3, 7, 64, 1 << 16]
+
+# strings that trip a naive scanner: escaped quotes and backslashes, brackets, unicode escapes
+TRICKY = 'say \\"hi\\" ] } { [ , : \\\\ \\\\" \\u00e9 \\ud83d\\ude00 \n\t end\\'
+
+
+def entry(url, text="", **extra):
+    return {
+        "startedDateTime": "2025-01-01T00:00:00Z",
+        **extra,
+        "request": {"method": "POST", "url": url, "headers": [{"name": "x", "value": text}]},
+        "response": {"status": 200, "content": {"mimeType": "text/event-stream", "text": text}},
+    }
+
+
+def reference(doc, match):
+    """Matching entries as a full json.load would find them."""
+    entries = doc["log"].get("entries", []) if "log" in doc else doc.get("entries", [])
+    return [e for e in entries
+            if isinstance(e, dict) and isinstance(e.get("request"), dict) and match(e["request"].get("url"))]
+
+
+DOCUMENTS = {
+    "log.entries": {"log": {"version": "1.2", "creator": {"name": "x"}, "entries": [
+        entry("https://chatgpt.com/other", TRICKY),
+        entry(TARGET, "data: {\"v\": \"" + TRICKY + "\"}"),
+        entry("https://example.com/", "x" * 300),
+    ]}},
+    "top-level entries": {"entries": [entry("https://a.example/", TRICKY), entry(TARGET, TRICKY)]},
+    "several matches": {"log": {"entries": [entry(TARGET, "first"), entry("https://b.example/"),
+                                            entry(TARGET, "second " + TRICKY)]}},
+    "fields before request": {"log": {"entries": [
+        {"_initiator": {"type": "script", "stack": [TRICKY, [1, [2, {"a": None}]]]},
+         "time": 12.5, "cache": {}, "request": {"headers": [], "url": TARGET}, "response": {"text": TRICKY}},
+    ]}},
+    "nested entries keys": {"log": {
+        "creator": {"entries": [entry(TARGET, "in creator")]},
+        "pages": [{"id": "page_1", "entries": [entry(TARGET, "in pages")]}],
+        "entries": [entry("https://c.example/", _nested={"entries": [entry(TARGET, "inside an entry")]}),
+                    entry(TARGET, "real")],
+    }},
+    "non-object entries": {"log": {"entries": [None, 3, "str", [entry(TARGET)], entry(TARGET, "ok"),
+                                               {"request": "not an object"}, {"response": {}}]}},
+    "scalars everywhere": {"log": {"entries": [
+        entry(TARGET, "", n=-1.5e10, t=True, f=False, z=None, e=[], o={}),
+    ]}},
+    "missing log.entries": {"log": {"version": "1.2", "pages": [{"entries": [entry(TARGET)]}]}},
+    "empty entries": {"log": {"entries": []}},
+    "no matching entry": {"log": {"entries": [entry("https://chatgpt.com/backend-api/f/conversation/prepare"),
+                                              entry(TARGET.upper()), entry(None)]}},
+}
+
+
+def dumps_variants(doc):
+    return {
+        "compact": json.dumps(doc, separators=(",", ":")),
+        "indented": json.dumps(doc, indent=2),
+        "unicode": json.dumps(doc, ensure_ascii=False, indent="\t"),
+    }
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+@pytest.mark.parametrize("layout", ["compact", "indented", "unicode"])
+@pytest.mark.parametrize("name", list(DOCUMENTS))
+def test_matches_json_load(name, layout, chunk_size):
+    doc = DOCUMENTS[name]
+    text = dumps_variants(doc)[layout]
+    match = url_matcher(TARGET)
+    expected = reference(json.loads(text), match)
+    assert list(iter_har_entries(io.StringIO(text), match, chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_matches_url_patterns(chunk_size):
+    doc = DOCUMENTS["nested entries keys"]["log"]
+    doc = {"log": {"entries": doc["entries"] + [entry(TARGET + "/prepare"), entry("https://d.example/x")]}}
+    text = json.dumps(doc)
+    match = url_matcher([TARGET + "*", "re:https://d\\.example/"])
+    expected = reference(doc, match)
+    assert len(expected) == 3
+    assert list(iter_har_entries(io.StringIO(text), match, chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+@pytest.mark.parametrize("cut", [0.3, 0.6, 0.95])
+def test_truncated_document_raises(chunk_size, cut):
+    text = json.dumps(DOCUMENTS["log.entries"])
+    with pytest.raises(ValueError):
+        list(iter_har_entries(io.StringIO(text[:int(len(text) * cut)]), url_matcher(TARGET), chunk_size=chunk_size))
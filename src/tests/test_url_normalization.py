@@ -0,0 +1,115 @@
+"""
+Public-suffix lookup, registrable-domain normalization and the
+registrable match tier of SerpIndex.
+"""
+import csv
+
+import pytest
+
+from evaluators import public_suffix
+from evaluators.evaluation import MATCH_TIERS, REGISTRABLE_TIER, SerpIndex
+from evaluators.public_suffix import PublicSuffixTrie, default_trie, use_list_file
+from evaluators.url_normalization import registrable_domain, registrable_url
+
+PSL_RULES = """
+// comment lines and blank lines are ignored
+
+com
+uk
+co.uk
+jp
+*.kawasaki.jp
+!city.kawasaki.jp
+*.ck
+!www.ck
+"""
+
+
+@pytest.mark.parametrize("host, expected", [
+    ("example.com", "example.com"),
+    ("a.b.example.com", "example.com"),
+    ("news.bbc.co.uk", "bbc.co.uk"),
+    ("co.uk", None),
+    ("com", None),
+    ("foo.bar.kawasaki.jp", "foo.bar.kawasaki.jp"),   # wildcard: bar.kawasaki.jp is a suffix
+    ("bar.kawasaki.jp", None),
+    ("www.city.kawasaki.jp", "city.kawasaki.jp"),     # exception beats the wildcard
+    ("www.ck", "www.ck"),
+    ("shop.example.ck", "shop.example.ck"),
+    ("example.zz", "example.zz"),                     # unlisted TLD: one-label suffix
+])
+def test_trie_rules(host, expected):
+    trie = PublicSuffixTrie.from_text(PSL_RULES)
+    assert trie.registrable_domain(host) == expected
+
+
+@pytest.mark.parametrize("host, expected", [
+    ("news.bbc.co.uk", "bbc.co.uk"),
+    ("WWW.Example.COM.", "example.com"),
+    ("x.punjab.gos.pk", "punjab.gos.pk"),
+    ("user.github.io", "user.github.io"),
+    ("foo.blogspot.com", "foo.blogspot.com"),
+    ("shop.example.com.au", "example.com.au"),
+    ("10.0.0.1", None),
+    ("[::1]", None),
+    ("co.uk", None),
+])
+def test_registrable_domain(host, expected):
+    assert registrable_domain(host) == expected
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://news.bbc.co.uk/news/uk-123", "bbc.co.uk/news/uk-123"),
+    ("https://www.bbc.co.uk/news/uk-123/", "bbc.co.uk/news/uk-123"),
+    ("http://m.en.wikipedia.org/wiki/X?utm_source=chatgpt.com", "wikipedia.org/wiki/X"),
+    ("https://amp.docs.example.com/page/amp?b=2&a=1", "example.com/page?a=1&b=2"),
+    ("http://10.0.0.1:8080/a", "10.0.0.1:8080/a"),
+    ("https://co.uk/x", "co.uk/x"),
+])
+def test_registrable_url(url, expected):
+    assert registrable_url(url) == expected
+
+
+def test_use_list_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(public_suffix, "_default_trie", None)
+    assert default_trie().registrable_domain("a.b.zz") == "b.zz"
+    path = tmp_path / "public_suffix_list.dat"
+    path.write_text(PSL_RULES + "*.zz\n", encoding="utf-8")
+    use_list_file(str(path))
+    assert default_trie().registrable_domain("a.b.zz") == "a.b.zz"
+
+
+def write_csv(path, urls):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Page Title", "URL"])
+        writer.writerows(("title", url) for url in urls)
+    return str(path)
+
+
+def test_registrable_tier(tmp_path):
+    bing = write_csv(tmp_path / "h_1_bing_q.csv", [
+        "https://www.example.com/other",
+        "https://blog.example.com/post/1",
+        "https://docs.example.com/guide",
+    ])
+    google = write_csv(tmp_path / "h_1_google_q.csv", ["https://example.com/guide/install"])
+    index = SerpIndex.from_csvs([bing, google])
+    urls = ["https://example.com/post/1", "https://example.com/guide/install/step-2",
+            "https://other.org/post/1"]
+
+    found, not_found = index.match(urls, [bing, google], MATCH_TIERS)
+    assert "https://example.com/post/1" not in found
+
+    tiers = ("exact", "normalized", "canonical", REGISTRABLE_TIER, "path-prefix")
+    found, not_found = index.match(urls, [bing, google], tiers)
+    assert found["https://example.com/post/1"] == [(bing, 2, REGISTRABLE_TIER)]
+    # no registrable-domain equal; the parent path still matches after it
+    assert found["https://example.com/guide/install/step-2"] == [(google, 1, "path-prefix")]
+    assert not_found == ["https://other.org/post/1"]
+
+
+def test_unknown_tier(tmp_path):
+    index = SerpIndex.from_csvs([write_csv(tmp_path / "h_1_bing_q.csv", ["https://example.com/"])])
+    with pytest.raises(ValueError):
+        index.match(["https://example.com/"], None, ("exact", "domain"))